@@ -1,6 +1,11 @@
 import boto3
-from typing import Dict, Any, List
+import botocore.session
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from typing import Dict, Any, List, Tuple
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,7 +15,20 @@ class AWSClient:
         self.aws_access_key_id = os.getenv('AWS_ACCESS_KEY_ID')
         self.aws_secret_access_key = os.getenv('AWS_SECRET_ACCESS_KEY')
         self.default_region = os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
-        
+
+        # Connection pool settings shared by every pooled client
+        self.max_pool_connections = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '50'))
+        self.client_idle_timeout = float(os.getenv('AWS_CLIENT_IDLE_TIMEOUT', '300'))
+        self.client_config = Config(
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=True
+        )
+
+        # One botocore session so service models and endpoint data are loaded once
+        self._session = boto3.session.Session(botocore_session=botocore.session.get_session())
+        self._clients: Dict[Tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
         # List of all AWS regions
         self.all_regions = [
             'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
@@ -19,31 +37,94 @@ class AWSClient:
             'ca-central-1', 'sa-east-1', 'af-south-1', 'me-south-1',
             'ap-east-1', 'eu-south-1', 'ap-northeast-3'
         ]
-        
-    def get_client(self, service_name: str, region: str = None):
-        """Get AWS service client for specified region"""
+
+    def get_client(self, service_name: str, region: str = None, config: Config = None):
+        """Get pooled AWS service client for specified region
+
+        A config (kept by the caller and passed each time) is merged over the shared one and gets
+        its own pooled client, for callers that need different timeouts, retries or pool size.
+        """
         region = region or self.default_region
-        return boto3.client(
-            service_name,
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            region_name=region
-        )
-    
+        key = (service_name, region, self.aws_access_key_id, self.aws_secret_access_key, config)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle_clients(now)
+            entry = self._clients.get(key)
+            if entry is None:
+                # Client creation is not thread-safe on a shared session, clients themselves are
+                entry = {
+                    'client': self._session.client(
+                        service_name,
+                        aws_access_key_id=self.aws_access_key_id,
+                        aws_secret_access_key=self.aws_secret_access_key,
+                        region_name=region,
+                        config=self.client_config.merge(config) if config else self.client_config
+                    ),
+                    'last_used': now
+                }
+                self._clients[key] = entry
+            entry['last_used'] = now
+            return entry['client']
+
     def get_resource(self, service_name: str, region: str = None):
         """Get AWS service resource for specified region"""
+        # Resources are not thread-safe, so they are built per call from the shared session
         region = region or self.default_region
-        return boto3.resource(
-            service_name,
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            region_name=region
-        )
-    
+        with self._lock:
+            return self._session.resource(
+                service_name,
+                aws_access_key_id=self.aws_access_key_id,
+                aws_secret_access_key=self.aws_secret_access_key,
+                region_name=region,
+                config=self.client_config
+            )
+
+    def ensure_bucket(self, bucket: str, region: str = None):
+        """Create a private bucket for the app's own state if it does not exist yet"""
+        region = region or self.default_region
+        s3_client = self.get_client('s3', region)
+        try:
+            s3_client.head_bucket(Bucket=bucket)
+            return
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('404', 'NoSuchBucket', 'NotFound'):
+                raise
+
+        params = {'Bucket': bucket}
+        if region != 'us-east-1':
+            params['CreateBucketConfiguration'] = {'LocationConstraint': region}
+        try:
+            s3_client.create_bucket(**params)
+        except s3_client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+
+    def _evict_idle_clients(self, now: float):
+        """Drop clients that have not been looked up within the idle timeout.
+
+        last_used only moves on get_client, so a long-running job may still hold an "idle" client.
+        Evicted clients are therefore not closed; their connections go when the last holder drops them.
+        """
+        if self.client_idle_timeout <= 0:
+            return
+        idle_keys = [
+            key for key, entry in self._clients.items()
+            if now - entry['last_used'] > self.client_idle_timeout
+        ]
+        for key in idle_keys:
+            del self._clients[key]
+
+    def close(self):
+        """Close all pooled clients"""
+        with self._lock:
+            for entry in self._clients.values():
+                entry['client'].close()
+            self._clients.clear()
+
     def get_all_regions(self) -> List[str]:
         """Get list of all available AWS regions"""
         return self.all_regions
-    
+
     def get_available_regions(self, service_name: str) -> List[str]:
         """Get list of regions where a specific service is available"""
         try:
@@ -0,0 +1,297 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional
+
+class PersistentTTLCache:
+    """Thread-safe key/value cache with a per-entry TTL, persisted to a JSON file"""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry['stored_at'] > self.ttl:
+                del self._entries[key]
+                return None
+            return entry['value']
+
+    def set(self, key: str, value: Any):
+        """Store a single value"""
+        self.set_many({key: value})
+
+    def set_many(self, values: Dict[str, Any]):
+        """Store several values with one write to disk"""
+        if not values:
+            return
+        now = time.time()
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = {'value': value, 'stored_at': now}
+            self._save()
+
+    def invalidate(self, key: str):
+        """Drop a single entry"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def retain(self, keys: Iterable[str]):
+        """Drop every entry whose key is not in keys"""
+        keep = set(keys)
+        with self._lock:
+            stale = [key for key in self._entries if key not in keep]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._save()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        # Write to a temp file and rename so a crash never leaves a half-written cache
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f, default=str)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Failed to persist cache {self.path}: {str(e)}")
+
+class ResponseCache:
+    """On-disk HTTP response cache with one JSON file per entry, for conditional revalidation,
+    size-bounded with least recently used entries evicted first"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a stored response (etag, last_modified, headers, body) or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            # Touch so eviction sees it as recently used
+            os.utime(path)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, entry: Dict[str, Any]):
+        """Store a response, replacing any previous one atomically"""
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            size = os.path.getsize(tmp_path)
+            with self._lock:
+                total = self._current_total()
+                try:
+                    total -= os.path.getsize(path)
+                except OSError:
+                    pass
+                os.replace(tmp_path, path)
+                self._total_bytes = total + size
+                if self._total_bytes > self.max_bytes:
+                    self._evict(keep=path)
+        except OSError as e:
+            print(f"Failed to persist cached response {key}: {str(e)}")
+
+    def _current_total(self) -> int:
+        # Sized from disk once, then kept up to date so writes don't rescan the directory
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._files())
+        return self._total_bytes
+
+    def _evict(self, keep: str):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def _files(self):
+        entries = []
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def record(self, hit: bool):
+        """Count a revalidated (hit) or fully transferred (miss) response"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, entry count and size on disk"""
+        try:
+            entries = sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+        except OSError:
+            entries = 0
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'entries': entries,
+                'bytes': self._current_total(),
+                'max_bytes': self.max_bytes
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+class LeasedArtifact(io.BufferedReader):
+    """A cached artifact opened for reading that holds off its eviction until closed"""
+
+    def __init__(self, path: str, release: Callable[[str], None]):
+        super().__init__(io.FileIO(path, 'rb'))
+        self._release = release
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release(self.name)
+
+class ArtifactCache:
+    """Size-bounded on-disk LRU store of build artifacts keyed by content identity.
+
+    Worker processes reopen artifacts by path, so an artifact is never evicted while a handle
+    from open() or store_file() is still open.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Reentrant: a dropped handle can release its lease from a finalizer while the lock is held
+        self._lock = threading.RLock()
+        self._leases: Dict[str, int] = {}
+
+    def open(self, *key_parts: str) -> Optional[BinaryIO]:
+        """Open a cached artifact for reading, or None if it is not cached"""
+        path = self._path(key_parts)
+        with self._lock:
+            try:
+                # Touch so eviction sees it as recently used
+                os.utime(path)
+                return self._lease(path)
+            except OSError:
+                return None
+
+    def store(self, source: BinaryIO, *key_parts: str) -> BinaryIO:
+        """Copy an artifact into the cache and return it opened from the cache"""
+        tmp_path = self.reserve()
+        source.seek(0)
+        with open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(source, f, 1024 * 1024)
+        return self.store_file(tmp_path, *key_parts)
+
+    def reserve(self) -> str:
+        """Create an empty temp file in the cache directory for an artifact to be written into"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        return tmp_path
+
+    def store_file(self, tmp_path: str, *key_parts: str) -> BinaryIO:
+        """Move an artifact written to a reserve()d path into the cache and return it opened from the cache"""
+        path = self._path(key_parts)
+        with self._lock:
+            os.replace(tmp_path, path)
+            artifact = self._lease(path)
+            self._evict()
+        return artifact
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and total size on disk"""
+        with self._lock:
+            files = self._files()
+        return {'entries': len(files), 'bytes': sum(size for _, size, _ in files), 'max_bytes': self.max_bytes}
+
+    def _lease(self, path: str) -> BinaryIO:
+        artifact = LeasedArtifact(path, self._release)
+        self._leases[path] = self._leases.get(path, 0) + 1
+        return artifact
+
+    def _release(self, path: str):
+        with self._lock:
+            self._leases[path] -= 1
+            if not self._leases[path]:
+                del self._leases[path]
+
+    def _evict(self):
+        """Delete least recently used artifacts until the cache fits in max_bytes, skipping leased ones"""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if path in self._leases:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def _files(self):
+        entries = []
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.artifact'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _path(self, key_parts) -> str:
+        key = hashlib.sha256('\n'.join(key_parts).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{key}.artifact")
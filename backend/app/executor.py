@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class BlockingExecutor:
+    """Runs blocking SDK and HTTP calls on sized thread pools, and CPU-bound work on a process pool, off the event loop"""
+
+    def __init__(self):
+        self.aws_max_workers = int(os.getenv('AWS_EXECUTOR_WORKERS', '32'))
+        self.github_max_workers = int(os.getenv('GITHUB_EXECUTOR_WORKERS', '8'))
+        self.aws_timeout = float(os.getenv('AWS_CALL_TIMEOUT', '60'))
+        self.github_timeout = float(os.getenv('GITHUB_CALL_TIMEOUT', '120'))
+        self.cpu_max_workers = int(os.getenv('CPU_EXECUTOR_WORKERS') or os.cpu_count() or 2)
+        self.cpu_timeout = float(os.getenv('CPU_CALL_TIMEOUT', '300'))
+        self.invoke_max_workers = int(os.getenv('LAMBDA_INVOKE_MAX_CONCURRENCY', '256'))
+        self.invoke_timeout = float(os.getenv('LAMBDA_INVOKE_TIMEOUT', '900'))
+
+        self.aws_pool = ThreadPoolExecutor(max_workers=self.aws_max_workers, thread_name_prefix='aws')
+        self.github_pool = ThreadPoolExecutor(max_workers=self.github_max_workers, thread_name_prefix='github')
+        # Lambda invocations can each run for minutes, so they get their own pool rather than starving AWS calls
+        self.invoke_pool = ThreadPoolExecutor(max_workers=self.invoke_max_workers, thread_name_prefix='invoke')
+        # Spawned rather than forked: the API process has live threads and pooled sockets by now
+        self.cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    async def run_aws(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run a blocking boto3 call on the AWS pool"""
+        return await self._run(self.aws_pool, timeout or self.aws_timeout, func, *args, **kwargs)
+
+    async def run_github(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run a blocking GitHub HTTP call on the GitHub pool"""
+        return await self._run(self.github_pool, timeout or self.github_timeout, func, *args, **kwargs)
+
+    async def run_invoke(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run a blocking Lambda invocation on the invoke pool"""
+        return await self._run(self.invoke_pool, timeout or self.invoke_timeout, func, *args, **kwargs)
+
+    async def run_cpu(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run a CPU-bound, picklable module-level function on the process pool so it can't hold the API's GIL"""
+        return await self._run(self.cpu_pool, timeout or self.cpu_timeout, func, *args, **kwargs)
+
+    async def iterate_aws(self, iterable: Iterable, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Pull items from a blocking iterator (e.g. a boto3 paginator) on the AWS pool one at a time"""
+        iterator = iter(iterable)
+        finished = object()
+        while True:
+            item = await self.run_aws(next, iterator, finished, timeout=timeout)
+            if item is finished:
+                return
+            yield item
+
+    async def _run(self, pool: Executor, timeout: float, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # The worker thread keeps running; only the caller stops waiting for it
+            name = getattr(func, '__name__', repr(func))
+            raise TimeoutError(f"{name} timed out after {timeout:g}s")
+
+    def shutdown(self):
+        """Stop accepting work and release pool threads and worker processes"""
+        self.aws_pool.shutdown(wait=False, cancel_futures=True)
+        self.github_pool.shutdown(wait=False, cancel_futures=True)
+        self.invoke_pool.shutdown(wait=False, cancel_futures=True)
+        self.cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+executor = BlockingExecutor()
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from botocore.exceptions import ClientError, ConnectTimeoutError, ReadTimeoutError
+from dotenv import load_dotenv
+from app.executor import executor
+from app.models.aws_models import RegionStatus
+
+load_dotenv()
+
+# Error codes AWS returns for regions the account cannot use
+DENIED_ERROR_CODES = {
+    'AccessDenied', 'AccessDeniedException', 'AuthFailure', 'UnauthorizedOperation',
+    'OptInRequired', 'InvalidClientTokenId', 'UnrecognizedClientException'
+}
+
+class RegionFanOut:
+    """Queries AWS regions concurrently and keeps whatever finishes in time"""
+
+    def __init__(self):
+        self.concurrency = int(os.getenv('AWS_FANOUT_CONCURRENCY', '8'))
+        self.region_deadline = float(os.getenv('AWS_REGION_DEADLINE', '10'))
+        self.stream_buffer = int(os.getenv('AWS_FANOUT_STREAM_BUFFER', '16'))
+
+    async def run(
+        self,
+        func: Callable[[str], Any],
+        regions: List[str],
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        raise_if_all_fail: bool = False
+    ) -> Tuple[Dict[str, Any], List[RegionStatus]]:
+        """Call func(region) for every region; return results of successful regions and per-region status
+
+        With raise_if_all_fail, the first region's error is raised when no region succeeds, so an
+        explicitly requested region (or a bad credential everywhere) fails loudly instead of looking empty.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+        deadline = deadline or self.region_deadline
+
+        async def query(region: str):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await executor.run_aws(func, region, timeout=deadline)
+                    return result, self._status(region, 'ok', start), None
+                except Exception as e:
+                    return None, self._status(region, self._classify(e), start, e), e
+
+        outcomes = await asyncio.gather(*(query(region) for region in regions))
+        if raise_if_all_fail:
+            self._raise_if_all_failed([error for _, _, error in outcomes])
+        results = {
+            status.region: result
+            for result, status, _ in outcomes
+            if status.status == 'ok'
+        }
+        return results, [status for _, status, _ in outcomes]
+
+    async def collect(
+        self,
+        func: Callable[[str], Iterable[Any]],
+        regions: List[str],
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        raise_if_all_fail: bool = False
+    ) -> Tuple[Dict[str, List[Any]], List[RegionStatus]]:
+        """Like run, for paginated regions: func(region) yields pages, and the deadline applies to each
+        page rather than the whole walk, so a large but healthy region isn't dropped as a timeout"""
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+        deadline = deadline or self.region_deadline
+
+        async def query(region: str):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    iterator = await executor.run_aws(lambda: iter(func(region)), timeout=deadline)
+                    pages = [page async for page in executor.iterate_aws(iterator, timeout=deadline)]
+                    return pages, self._status(region, 'ok', start), None
+                except Exception as e:
+                    return None, self._status(region, self._classify(e), start, e), e
+
+        outcomes = await asyncio.gather(*(query(region) for region in regions))
+        if raise_if_all_fail:
+            self._raise_if_all_failed([error for _, _, error in outcomes])
+        results = {
+            status.region: pages
+            for pages, status, _ in outcomes
+            if status.status == 'ok'
+        }
+        return results, [status for _, status, _ in outcomes]
+
+    async def stream(
+        self,
+        func: Callable[[str], Iterable[Any]],
+        regions: List[str],
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        statuses: Optional[List[RegionStatus]] = None,
+        raise_if_all_fail: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (region, item) pairs from func(region) iterators as soon as each item arrives
+
+        Every item is pulled off the event loop with its own deadline, and a bounded
+        buffer keeps producers from running ahead of the consumer. Per-region status
+        is appended to statuses when a list is passed in. raise_if_all_fail is as for
+        run, raised once every region has finished.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+        deadline = deadline or self.region_deadline
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.stream_buffer)
+        finished = object()
+        errors: List[Optional[Exception]] = []
+
+        async def pump(region: str):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    iterator = await executor.run_aws(lambda: iter(func(region)), timeout=deadline)
+                    while True:
+                        item = await executor.run_aws(next, iterator, finished, timeout=deadline)
+                        if item is finished:
+                            break
+                        await queue.put((region, item))
+                    status, error = self._status(region, 'ok', start), None
+                except Exception as e:
+                    status, error = self._status(region, self._classify(e), start, e), e
+                errors.append(error)
+                if statuses is not None:
+                    statuses.append(status)
+
+        async def close_when_done(tasks):
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await queue.put(finished)
+
+        tasks = [asyncio.create_task(pump(region)) for region in regions]
+        closer = asyncio.create_task(close_when_done(tasks))
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is finished:
+                    break
+                yield entry
+            if raise_if_all_fail:
+                self._raise_if_all_failed(errors)
+        finally:
+            # Stop producers if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+            closer.cancel()
+
+    def _raise_if_all_failed(self, errors: List[Optional[Exception]]):
+        if errors and all(error is not None for error in errors):
+            raise errors[0]
+
+    def _classify(self, error: Exception) -> str:
+        """Map an exception raised while querying a region to a region status"""
+        if isinstance(error, (TimeoutError, ConnectTimeoutError, ReadTimeoutError)):
+            return 'timeout'
+        if isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in DENIED_ERROR_CODES:
+            return 'denied'
+        return 'error'
+
+    def _status(self, region: str, status: str, start: float, error: Exception = None) -> RegionStatus:
+        return RegionStatus(
+            region=region,
+            status=status,
+            latency_ms=round((time.perf_counter() - start) * 1000, 1),
+            error=str(error) if error else None
+        )
+
+region_fanout = RegionFanOut()
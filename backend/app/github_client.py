@@ -0,0 +1,91 @@
+import hashlib
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+from app.cache import ResponseCache
+
+load_dotenv()
+
+# Response headers kept with cached bodies (Link carries pagination)
+CACHED_HEADERS = ('Link', 'ETag', 'Last-Modified')
+
+class GitHubClient:
+    def __init__(self):
+        self.base_url = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        self.max_pool_connections = int(os.getenv('GITHUB_MAX_POOL_CONNECTIONS', '20'))
+        # (connect, read) for every request; the read timeout bounds each socket read, so a stalled
+        # response frees its worker thread instead of holding it after the executor stops waiting
+        self.timeout = (
+            float(os.getenv('GITHUB_CONNECT_TIMEOUT', '5')),
+            float(os.getenv('GITHUB_READ_TIMEOUT', '30'))
+        )
+
+        # One keep-alive session so connections and TLS handshakes are reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_pool_connections)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/vnd.github.v3+json'})
+
+        self.cache = ResponseCache(
+            os.getenv('GITHUB_CACHE_DIR', '.cache/github'),
+            int(os.getenv('GITHUB_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+        )
+
+    def get_json(self, access_token: str, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, Dict[str, str]]:
+        """GET a JSON API resource, revalidating a cached copy with If-None-Match/If-Modified-Since"""
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        key = self._cache_key(access_token, url, params)
+        cached = self.cache.get(key)
+
+        headers = self._auth_headers(access_token)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            # Not modified: served locally, and GitHub does not count it against the rate limit
+            self.cache.record(hit=True)
+            return cached['body'], cached['headers']
+
+        response.raise_for_status()
+        self.cache.record(hit=False)
+        body = response.json()
+        kept_headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        if 'ETag' in response.headers or 'Last-Modified' in response.headers:
+            self.cache.set(key, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'headers': kept_headers,
+                'body': body
+            })
+        return body, kept_headers
+
+    def get(self, access_token: str, path: str, **kwargs) -> requests.Response:
+        """Uncached GET on the pooled session (archives and other binary payloads)"""
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, headers=self._auth_headers(access_token), **kwargs)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Conditional request cache statistics"""
+        return self.cache.stats()
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    def _auth_headers(self, access_token: str) -> Dict[str, str]:
+        return {'Authorization': f"token {access_token}"}
+
+    def _cache_key(self, access_token: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+        # Keyed per token since responses depend on what the token can see; the token itself is not stored
+        query = '&'.join(f"{name}={value}" for name, value in sorted((params or {}).items()))
+        return hashlib.sha256(f"{access_token}\n{url}?{query}".encode('utf-8')).hexdigest()
+
+github_client = GitHubClient()
@@ -0,0 +1,48 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional
+from app.models.aws_models import Job
+
+class JobManager:
+    """Runs long operations as background tasks and tracks their progress"""
+
+    def __init__(self):
+        self.jobs = {}  # In production, use a database
+        self._tasks = set()
+
+    def submit(self, kind: str, work: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Start work(job) in the background and return the job right away"""
+        job = Job(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            status="pending",
+            created_at=datetime.now()
+        )
+        self.jobs[job.id] = job
+
+        # Keep a reference so the task is not garbage collected while running
+        task = asyncio.create_task(self._run(job, work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, work: Callable[[Job], Awaitable[Any]]):
+        job.status = "running"
+        try:
+            job.result = await work(job)
+            job.status = "success"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        job.completed_at = datetime.now()
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Get job by ID"""
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """List all jobs"""
+        return list(self.jobs.values())
+
+job_manager = JobManager()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -12,6 +12,30 @@ class EC2Instance(BaseModel):
     tags: Optional[Dict[str, str]] = {}
     region: Optional[str] = None
 
+class EC2InstanceFilter(BaseModel):
+    states: Optional[List[str]] = None
+    instance_types: Optional[List[str]] = None
+    tags: Optional[Dict[str, Optional[str]]] = None  # None value matches any value for the key
+    vpc_id: Optional[str] = None
+    subnet_id: Optional[str] = None
+    launched_after: Optional[datetime] = None
+    launched_before: Optional[datetime] = None
+    max_results: Optional[int] = None
+
+class RegionStatus(BaseModel):
+    region: str
+    status: str  # "ok", "timeout", "denied", "error"
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+class EC2Inventory(BaseModel):
+    instances: List[EC2Instance]
+    regions: List[RegionStatus]
+
+class EC2InstancePage(BaseModel):
+    instances: List[EC2Instance]
+    next_cursor: Optional[str] = None
+
 class CreateEC2Request(BaseModel):
     instance_type: str = "t2.micro"
     ami_id: str = "ami-0c02fb55956c7d316"  # Amazon Linux 2
@@ -20,10 +44,55 @@ class CreateEC2Request(BaseModel):
     tags: Optional[Dict[str, str]] = {}
     region: Optional[str] = None
 
+class InstanceRef(BaseModel):
+    instance_id: str
+    region: Optional[str] = None
+
+class BatchInstanceRequest(BaseModel):
+    instances: List[InstanceRef]
+
+class BatchOperationResult(BaseModel):
+    instance_id: str
+    region: str
+    success: bool
+    previous_state: Optional[str] = None
+    current_state: Optional[str] = None
+    error: Optional[str] = None
+
+class StorageUsage(BaseModel):
+    object_count: int = 0
+    total_bytes: int = 0
+
+class BucketStats(BaseModel):
+    bucket: str
+    object_count: int = 0
+    total_bytes: int = 0
+    storage_classes: Dict[str, StorageUsage] = {}
+    size_histogram: Dict[str, int] = {}
+    largest_objects: List[Dict[str, Any]] = []
+    prefix_depth: int = 1
+    prefixes: Dict[str, StorageUsage] = {}
+    computed_at: Optional[datetime] = None
+
 class S3Bucket(BaseModel):
     name: str
     creation_date: Optional[datetime] = None
     region: Optional[str] = None
+    stats: Optional[BucketStats] = None
+
+class S3Object(BaseModel):
+    key: str
+    size: int
+    last_modified: Optional[datetime] = None
+    etag: Optional[str] = None
+    storage_class: Optional[str] = None
+
+class S3ObjectPage(BaseModel):
+    bucket: str
+    prefix: str = ""
+    objects: List[S3Object]
+    common_prefixes: List[str] = []
+    next_cursor: Optional[str] = None
 
 class CreateS3Request(BaseModel):
     bucket_name: str
@@ -37,8 +106,25 @@ class RDSInstance(BaseModel):
     endpoint: Optional[str] = None
     port: Optional[int] = None
     allocated_storage: Optional[int] = None
+    db_cluster_identifier: Optional[str] = None
     region: Optional[str] = None
 
+class RDSCluster(BaseModel):
+    db_cluster_identifier: str
+    engine: str
+    engine_version: Optional[str] = None
+    status: str
+    endpoint: Optional[str] = None
+    reader_endpoint: Optional[str] = None
+    port: Optional[int] = None
+    members: List[str] = []
+    region: Optional[str] = None
+
+class RDSInventory(BaseModel):
+    instances: List[RDSInstance]
+    clusters: List[RDSCluster]
+    regions: List[RegionStatus]
+
 class CreateRDSRequest(BaseModel):
     db_instance_identifier: str
     db_instance_class: str = "db.t3.micro"
@@ -48,14 +134,47 @@ class CreateRDSRequest(BaseModel):
     allocated_storage: int = 20
     region: Optional[str] = None
 
+class DBInstanceRef(BaseModel):
+    db_instance_identifier: str
+    region: Optional[str] = None
+
+class BatchDBInstanceRequest(BaseModel):
+    instances: List[DBInstanceRef]
+
 class LambdaFunction(BaseModel):
     function_name: str
-    runtime: str
-    handler: str
+    runtime: Optional[str] = None  # Container image functions have no runtime or handler
+    handler: Optional[str] = None
     role: str
     code_size: Optional[int] = None
     last_modified: Optional[str] = None
+    package_type: Optional[str] = None
     region: Optional[str] = None
+    # Only filled in when requested through the fields= projection
+    reserved_concurrency: Optional[int] = None
+    aliases: Optional[List[str]] = None
+    event_source_mappings: Optional[List[Dict[str, Any]]] = None
+    layers: Optional[List[str]] = None
+    # Requested field -> error, for detail fields that could not be loaded (those stay None)
+    detail_errors: Optional[Dict[str, str]] = None
+
+class LambdaInventory(BaseModel):
+    functions: List[LambdaFunction]
+    regions: List[RegionStatus]
+
+class BatchInvokeRequest(BaseModel):
+    payloads: List[Any]
+    invocation_type: str = "RequestResponse"  # "RequestResponse" or "Event"
+    concurrency: Optional[int] = Field(None, ge=1)
+
+class InvocationResult(BaseModel):
+    index: int
+    status_code: Optional[int] = None
+    duration_ms: float
+    function_error: Optional[str] = None
+    executed_version: Optional[str] = None
+    payload: Optional[Any] = None
+    error: Optional[str] = None
 
 class CreateLambdaRequest(BaseModel):
     function_name: str
@@ -64,3 +183,13 @@ class CreateLambdaRequest(BaseModel):
     role: str
     code: str
     region: Optional[str] = None
+
+class Job(BaseModel):
+    id: str
+    kind: str
+    status: str  # "pending", "running", "success", "failed"
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    progress: Dict[str, Any] = {}
+    result: Optional[Any] = None
+    error: Optional[str] = None
@@ -33,6 +33,7 @@ class DeploymentConfig(BaseModel):
     build_command: Optional[str] = None
     runtime: Optional[str] = None
     environment_variables: Optional[Dict[str, str]] = {}
+    sync: bool = False  # s3-static: skip unchanged files and delete ones an earlier deploy wrote that were removed
 
 class Deployment(BaseModel):
     id: str
@@ -40,7 +41,7 @@ class Deployment(BaseModel):
     branch: str
     commit_sha: str
     aws_service: str
-    status: str  # "pending", "building", "deploying", "success", "failed"
+    status: str  # "pending", "building", "deploying", "success", "failed", "cancelled"
     created_at: datetime
     completed_at: Optional[datetime] = None
     logs: Optional[str] = None
@@ -55,3 +56,17 @@ class ConnectRepositoryRequest(BaseModel):
 class CreateDeploymentRequest(BaseModel):
     access_token: str
     config: DeploymentConfig
+
+class RepositoryTreeEntry(BaseModel):
+    path: str
+    type: str  # "blob", "tree", "commit" (submodule)
+    sha: str
+    size: Optional[int] = None
+
+class RepositoryTreeListing(BaseModel):
+    repository_name: str
+    ref: str
+    commit_sha: str
+    tree_sha: str
+    truncated: bool = False
+    entries: List[RepositoryTreeEntry]
@@ -0,0 +1,44 @@
+import base64
+import json
+from typing import Any, AsyncIterator, Dict
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Encode pagination state as an opaque URL-safe cursor"""
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(state, dict):
+        raise ValueError("Invalid pagination cursor")
+    return state
+
+async def prefetch(items: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Pull the first item up front, so a stream that fails before producing anything raises
+    while the endpoint can still return an error status instead of an empty 200"""
+    first = await anext(items, None)
+
+    async def chained():
+        if first is not None:
+            yield first
+            async for item in items:
+                yield item
+
+    return chained()
+
+def ndjson_response(items: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """Stream models as newline-delimited JSON as they are produced"""
+    async def lines():
+        async for item in items:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
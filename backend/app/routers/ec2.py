@@ -1,10 +1,42 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends, Path
+from datetime import datetime
 from typing import List, Optional
-from app.models.aws_models import EC2Instance, CreateEC2Request
+from app.models.aws_models import (
+    EC2Instance, EC2InstanceFilter, EC2Inventory, EC2InstancePage, CreateEC2Request,
+    BatchInstanceRequest, BatchOperationResult
+)
 from app.services.ec2_service import ec2_service
+from app.pagination import ndjson_response, prefetch
 
 router = APIRouter()
 
+def instance_filters(
+    state: Optional[List[str]] = Query(None, description="Instance states, e.g. running"),
+    instance_type: Optional[List[str]] = Query(None, description="Instance types, e.g. t3.micro"),
+    tag: Optional[List[str]] = Query(None, description="Tag as Key=Value, or Key to match any value"),
+    vpc_id: Optional[str] = Query(None),
+    subnet_id: Optional[str] = Query(None),
+    launched_after: Optional[datetime] = Query(None),
+    launched_before: Optional[datetime] = Query(None),
+    max_results: Optional[int] = Query(None, ge=5, le=1000, description="describe_instances page size")
+) -> EC2InstanceFilter:
+    """Collect EC2 listing filters from query parameters"""
+    tags = {}
+    for entry in tag or []:
+        key, _, value = entry.partition('=')
+        tags[key] = value or None
+
+    return EC2InstanceFilter(
+        states=state,
+        instance_types=instance_type,
+        tags=tags or None,
+        vpc_id=vpc_id,
+        subnet_id=subnet_id,
+        launched_after=launched_after,
+        launched_before=launched_before,
+        max_results=max_results
+    )
+
 @router.get("/regions")
 async def get_regions():
     """Get all available AWS regions"""
@@ -14,10 +46,42 @@ async def get_regions():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/instances", response_model=List[EC2Instance])
-async def list_instances(region: Optional[str] = Query(None, description="AWS region to filter by")):
+async def list_instances(
+    region: Optional[str] = Query(None, description="AWS region to filter by"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json or ndjson (streamed)"),
+    filters: EC2InstanceFilter = Depends(instance_filters)
+):
     """List all EC2 instances"""
     try:
-        return await ec2_service.list_instances(region)
+        if format == "ndjson":
+            return ndjson_response(await prefetch(ec2_service.stream_instances(region, filters)))
+        return await ec2_service.list_instances(region, filters)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/instances/page", response_model=EC2InstancePage)
+async def list_instances_page(
+    region: Optional[str] = Query(None, description="AWS region to filter by"),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    page_size: int = Query(100, ge=1, le=1000),
+    filters: EC2InstanceFilter = Depends(instance_filters)
+):
+    """List EC2 instances one page at a time"""
+    try:
+        return await ec2_service.list_instances_page(region, cursor, page_size, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/inventory", response_model=EC2Inventory)
+async def list_inventory(
+    region: Optional[str] = Query(None, description="AWS region to filter by"),
+    filters: EC2InstanceFilter = Depends(instance_filters)
+):
+    """List EC2 instances with per-region query status"""
+    try:
+        return await ec2_service.list_inventory(region, filters)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -52,3 +116,14 @@ async def stop_instance(instance_id: str, region: Optional[str] = Query(None)):
         return await ec2_service.stop_instance(instance_id, region)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/instances:batch/{action}", response_model=List[BatchOperationResult])
+async def batch_instance_action(
+    request: BatchInstanceRequest,
+    action: str = Path(..., pattern="^(start|stop|terminate)$")
+):
+    """Start, stop or terminate many EC2 instances across regions"""
+    try:
+        return await ec2_service.batch_instance_action(action, request.instances)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
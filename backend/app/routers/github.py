@@ -1,21 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from typing import List, Optional
 from app.models.github_models import (
     GitHubRepository, 
     DeploymentConfig, 
     Deployment,
     ConnectRepositoryRequest,
-    CreateDeploymentRequest
+    CreateDeploymentRequest,
+    RepositoryTreeListing
 )
 from app.services.github_service import github_service, deployment_service
+from app.services.deployment_queue import deployment_queue
+from app.executor import executor
+from app.github_client import github_client
+from app.pagination import ndjson_response
 
 router = APIRouter(prefix="/github", tags=["GitHub"])
 
 @router.post("/repositories", response_model=List[GitHubRepository])
-async def get_repositories(request: ConnectRepositoryRequest):
+async def get_repositories(
+    request: ConnectRepositoryRequest,
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json or ndjson (streamed)")
+):
     """Get user's GitHub repositories"""
     try:
-        repositories = github_service.get_user_repositories(request.access_token)
+        if format == "ndjson":
+            return ndjson_response(github_service.stream_user_repositories(request.access_token))
+        repositories = await github_service.get_user_repositories(request.access_token)
         return repositories
     except Exception as e:
         raise HTTPException(
@@ -31,7 +41,9 @@ async def get_repository_content(
 ):
     """Get repository content"""
     try:
-        content = github_service.get_repository_content(access_token, repo_full_name, path)
+        content = await executor.run_github(
+            github_service.get_repository_content, access_token, repo_full_name, path
+        )
         return content
     except Exception as e:
         raise HTTPException(
@@ -39,9 +51,42 @@ async def get_repository_content(
             detail=f"Failed to fetch repository content: {str(e)}"
         )
 
-@router.post("/deploy", response_model=Deployment)
+@router.get("/repositories/{repo_full_name:path}/tree", response_model=RepositoryTreeListing)
+async def get_repository_tree(
+    repo_full_name: str,
+    access_token: str,
+    ref: str = "HEAD",
+    path: Optional[str] = Query(None, description="Only list the direct children of this directory"),
+    pattern: Optional[str] = Query(None, description="Only list paths matching this glob, e.g. **/*.html")
+):
+    """Get the full repository file tree in one call"""
+    try:
+        commit, tree = await executor.run_github(
+            github_service.get_repository_tree, access_token, repo_full_name, ref
+        )
+        if path is not None:
+            entries = tree.list_dir(path)
+        elif pattern:
+            entries = tree.glob(pattern)
+        else:
+            entries = tree.entries
+        return RepositoryTreeListing(
+            repository_name=repo_full_name,
+            ref=ref,
+            commit_sha=commit['commit_sha'],
+            tree_sha=commit['tree_sha'],
+            truncated=tree.truncated,
+            entries=entries
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to fetch repository tree: {str(e)}"
+        )
+
+@router.post("/deploy", response_model=Deployment, status_code=status.HTTP_202_ACCEPTED)
 async def create_deployment(request: CreateDeploymentRequest):
-    """Create a new deployment"""
+    """Queue a new deployment and return it right away"""
     try:
         deployment = await deployment_service.create_deployment(
             request.access_token,
@@ -54,6 +99,11 @@ async def create_deployment(request: CreateDeploymentRequest):
             detail=f"Failed to create deployment: {str(e)}"
         )
 
+@router.get("/deployment-queue")
+async def get_deployment_queue():
+    """Get deployment queue depth and concurrency"""
+    return deployment_queue.stats()
+
 @router.get("/deployments", response_model=List[Deployment])
 async def list_deployments():
     """List all deployments"""
@@ -71,6 +121,28 @@ async def get_deployment(deployment_id: str):
         )
     return deployment
 
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Get GitHub response cache and deployment artifact cache statistics"""
+    return {
+        "responses": github_client.cache_stats(),
+        "artifacts": deployment_service.artifact_cache.stats()
+    }
+
+@router.post("/deployments/{deployment_id}/cancel", response_model=Deployment)
+async def cancel_deployment(deployment_id: str):
+    """Cancel a queued or running deployment"""
+    try:
+        deployment = deployment_service.cancel_deployment(deployment_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if not deployment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deployment not found"
+        )
+    return deployment
+
 @router.get("/deployment-templates")
 async def get_deployment_templates():
     """Get available deployment templates"""
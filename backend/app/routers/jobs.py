@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException
+from typing import List
+from app.models.aws_models import Job
+from app.jobs import job_manager
+
+router = APIRouter()
+
+@router.get("", response_model=List[Job])
+async def list_jobs():
+    """List all background jobs"""
+    return job_manager.list_jobs()
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """Get background job status and progress"""
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
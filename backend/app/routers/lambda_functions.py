@@ -1,15 +1,37 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from app.models.aws_models import LambdaFunction, CreateLambdaRequest
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from app.models.aws_models import LambdaFunction, LambdaInventory, CreateLambdaRequest, BatchInvokeRequest
 from app.services.lambda_service import lambda_service
+from app.pagination import ndjson_response
 
 router = APIRouter()
 
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    return [field.strip() for field in (fields or "").split(",") if field.strip()]
+
 @router.get("/functions", response_model=List[LambdaFunction])
-async def list_functions():
+async def list_functions(
+    region: Optional[str] = Query(None, description="AWS region to filter by"),
+    fields: Optional[str] = Query(None, description="Extra details: concurrency,aliases,event_source_mappings,layers")
+):
     """List all Lambda functions"""
     try:
-        return await lambda_service.list_functions()
+        return await lambda_service.list_functions(region, _parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/inventory", response_model=LambdaInventory)
+async def list_inventory(
+    region: Optional[str] = Query(None, description="AWS region to filter by"),
+    fields: Optional[str] = Query(None, description="Extra details: concurrency,aliases,event_source_mappings,layers")
+):
+    """List Lambda functions with per-region query status"""
+    try:
+        return await lambda_service.list_inventory(region, _parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -22,25 +44,35 @@ async def create_function(request: CreateLambdaRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/functions/{function_name}")
-async def delete_function(function_name: str):
+async def delete_function(function_name: str, region: Optional[str] = Query(None)):
     """Delete a Lambda function"""
     try:
-        return await lambda_service.delete_function(function_name)
+        return await lambda_service.delete_function(function_name, region)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/functions/{function_name}/invoke")
-async def invoke_function(function_name: str, payload: dict = None):
+async def invoke_function(function_name: str, payload: dict = None, region: Optional[str] = Query(None)):
     """Invoke a Lambda function"""
     try:
-        return await lambda_service.invoke_function(function_name, payload)
+        return await lambda_service.invoke_function(function_name, payload, region)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/functions/{function_name}/invoke:batch")
+async def batch_invoke_function(function_name: str, request: BatchInvokeRequest, region: Optional[str] = Query(None)):
+    """Invoke a Lambda function once per payload; results stream back as NDJSON as they complete"""
+    if request.invocation_type not in ("RequestResponse", "Event"):
+        raise HTTPException(status_code=400, detail=f"Unsupported invocation type: {request.invocation_type}")
+    try:
+        return ndjson_response(lambda_service.stream_invocations(function_name, request, region))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/functions/{function_name}")
-async def get_function(function_name: str):
+async def get_function(function_name: str, region: Optional[str] = Query(None)):
     """Get Lambda function details"""
     try:
-        return await lambda_service.get_function(function_name)
+        return await lambda_service.get_function(function_name, region)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
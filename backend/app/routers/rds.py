@@ -1,15 +1,33 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from app.models.aws_models import RDSInstance, CreateRDSRequest
+from fastapi import APIRouter, HTTPException, Path, Query
+from typing import List, Optional
+from app.models.aws_models import (
+    RDSInstance, RDSCluster, RDSInventory, CreateRDSRequest, BatchDBInstanceRequest, BatchOperationResult
+)
 from app.services.rds_service import rds_service
 
 router = APIRouter()
 
 @router.get("/instances", response_model=List[RDSInstance])
-async def list_instances():
+async def list_instances(region: Optional[str] = Query(None, description="AWS region to filter by")):
     """List all RDS instances"""
     try:
-        return await rds_service.list_instances()
+        return await rds_service.list_instances(region)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/clusters", response_model=List[RDSCluster])
+async def list_clusters(region: Optional[str] = Query(None, description="AWS region to filter by")):
+    """List all Aurora and Multi-AZ DB clusters"""
+    try:
+        return await rds_service.list_clusters(region)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/inventory", response_model=RDSInventory)
+async def list_inventory(region: Optional[str] = Query(None, description="AWS region to filter by")):
+    """List RDS instances and clusters with per-region query status"""
+    try:
+        return await rds_service.list_inventory(region)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -22,25 +40,36 @@ async def create_instance(request: CreateRDSRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/instances/{db_instance_identifier}")
-async def delete_instance(db_instance_identifier: str):
+async def delete_instance(db_instance_identifier: str, region: Optional[str] = Query(None)):
     """Delete an RDS instance"""
     try:
-        return await rds_service.delete_instance(db_instance_identifier)
+        return await rds_service.delete_instance(db_instance_identifier, region)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/instances/{db_instance_identifier}/start")
-async def start_instance(db_instance_identifier: str):
+async def start_instance(db_instance_identifier: str, region: Optional[str] = Query(None)):
     """Start an RDS instance"""
     try:
-        return await rds_service.start_instance(db_instance_identifier)
+        return await rds_service.start_instance(db_instance_identifier, region)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/instances/{db_instance_identifier}/stop")
-async def stop_instance(db_instance_identifier: str):
+async def stop_instance(db_instance_identifier: str, region: Optional[str] = Query(None)):
     """Stop an RDS instance"""
     try:
-        return await rds_service.stop_instance(db_instance_identifier)
+        return await rds_service.stop_instance(db_instance_identifier, region)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/instances:batch/{action}", response_model=List[BatchOperationResult])
+async def batch_instance_action(
+    request: BatchDBInstanceRequest,
+    action: str = Path(..., pattern="^(start|stop)$")
+):
+    """Start or stop many RDS instances across regions"""
+    try:
+        return await rds_service.batch_instance_action(action, request.instances)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from app.models.aws_models import S3Bucket, CreateS3Request
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from app.models.aws_models import S3Bucket, S3ObjectPage, BucketStats, CreateS3Request, Job
 from app.services.s3_service import s3_service
+from app.pagination import ndjson_response
 
 router = APIRouter()
 
 @router.get("/buckets", response_model=List[S3Bucket])
-async def list_buckets():
+async def list_buckets(include_stats: bool = Query(False, description="Attach cached bucket statistics")):
     """List all S3 buckets"""
     try:
-        return await s3_service.list_buckets()
+        return await s3_service.list_buckets(include_stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -21,18 +22,49 @@ async def create_bucket(request: CreateS3Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/buckets/{bucket_name}")
+@router.delete("/buckets/{bucket_name}", response_model=Job, status_code=202)
 async def delete_bucket(bucket_name: str):
-    """Delete an S3 bucket"""
+    """Empty and delete an S3 bucket; poll /api/jobs/{id} for progress"""
     try:
         return await s3_service.delete_bucket(bucket_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/buckets/{bucket_name}/objects")
-async def list_objects(bucket_name: str):
+@router.get("/buckets/{bucket_name}/objects", response_model=S3ObjectPage)
+async def list_objects(
+    bucket_name: str,
+    prefix: str = Query("", description="Only list keys starting with this prefix"),
+    delimiter: Optional[str] = Query(None, description="Group keys into folders, usually /"),
+    page_size: int = Query(1000, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json page or ndjson stream of every key")
+):
     """List objects in an S3 bucket"""
     try:
-        return await s3_service.list_objects(bucket_name)
+        if format == "ndjson":
+            return ndjson_response(s3_service.stream_objects(bucket_name, prefix))
+        return await s3_service.list_objects(bucket_name, prefix, delimiter, page_size, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/buckets/{bucket_name}/stats", response_model=Job, status_code=202)
+async def compute_bucket_stats(
+    bucket_name: str,
+    prefix_depth: int = Query(1, ge=0, le=10, description="Folder depth for per-prefix rollups"),
+    top_n: int = Query(10, ge=1, le=1000, description="Number of largest keys to keep")
+):
+    """Compute bucket size statistics; poll /api/jobs/{id} for progress"""
+    try:
+        return await s3_service.compute_bucket_stats(bucket_name, prefix_depth, top_n)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/buckets/{bucket_name}/stats", response_model=BucketStats)
+async def get_bucket_stats(bucket_name: str):
+    """Get the last computed statistics for a bucket"""
+    stats = s3_service.get_bucket_stats(bucket_name)
+    if not stats:
+        raise HTTPException(status_code=404, detail="No statistics computed for this bucket")
+    return stats
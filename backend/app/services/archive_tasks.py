@@ -0,0 +1,105 @@
+import base64
+import hashlib
+import os
+import shutil
+import zipfile
+from typing import List, Optional, Tuple
+from app.services.static_assets import compress
+
+# CPU-bound archive work for the executor's process pool. Functions take file paths, never open files
+# or whole archives, so only member names and small results cross the process boundary; archive data
+# is streamed in chunks inside the worker. Keep this module free of boto3 and app-level imports:
+# every spawned worker imports it.
+
+# Fixed entry timestamp so identical sources always produce byte-identical zips
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# Read size for hashing and copying archives
+CHUNK_SIZE = 1024 * 1024
+
+# Each worker keeps its most recent archive open, so batches from one deploy parse the central directory once
+_open_archive_key = None
+_open_archive_zip: Optional[zipfile.ZipFile] = None
+
+def _open_archive(path: str) -> zipfile.ZipFile:
+    global _open_archive_key, _open_archive_zip
+    stat = os.stat(path)
+    # Cached artifacts are replaced, never rewritten, so inode and mtime identify the content
+    key = (path, stat.st_ino, stat.st_mtime_ns)
+    if key != _open_archive_key:
+        if _open_archive_zip is not None:
+            _open_archive_zip.close()
+        _open_archive_zip = zipfile.ZipFile(path, 'r')
+        _open_archive_key = key
+    return _open_archive_zip
+
+def strip_archive_prefix(filename: str) -> str:
+    """Path inside the repository: GitHub nests everything under "<owner>-<repo>-<sha>/" """
+    return '/'.join(filename.split('/')[1:])
+
+def list_site_files(archive_path: str) -> List[Tuple[str, str, int]]:
+    """(member name, object key, size) of every archive member a static site publishes"""
+    files = []
+    for file_info in _open_archive(archive_path).infolist():
+        if not file_info.is_dir() and not file_info.filename.startswith('.'):
+            clean_name = strip_archive_prefix(file_info.filename)
+            if clean_name:
+                files.append((file_info.filename, clean_name, file_info.file_size))
+    return files
+
+def prepare_assets(archive_path: str, members: List[Tuple[str, str, Optional[str]]],
+                   level: int) -> List[Tuple[str, bytes, Optional[str], str, int]]:
+    """Extract a batch of small members, compressing those given an encoding when that makes them smaller.
+
+    Returns (key, body, content encoding, body MD5, original size) per member.
+    """
+    source = _open_archive(archive_path)
+    prepared = []
+    for name, key, encoding in members:
+        body = source.read(name)
+        original_size = len(body)
+        if encoding:
+            compressed = compress(body, encoding, level)
+            if len(compressed) < original_size:
+                body = compressed
+            else:
+                encoding = None
+        prepared.append((key, body, encoding, hashlib.md5(body, usedforsecurity=False).hexdigest(), original_size))
+    return prepared
+
+def multipart_etag(archive_path: str, name: str, chunk_size: int) -> str:
+    """The ETag S3 assigns to a multipart upload of a member: MD5 of the part MD5s plus part count"""
+    part_digests = []
+    with _open_archive(archive_path).open(name) as body:
+        for part in iter(lambda: body.read(chunk_size), b''):
+            part_digests.append(hashlib.md5(part, usedforsecurity=False).digest())
+    return f"{hashlib.md5(b''.join(part_digests), usedforsecurity=False).hexdigest()}-{len(part_digests)}"
+
+def repack_archive(archive_path: str, package_path: str) -> str:
+    """Repack a GitHub zipball deterministically into package_path, with the top-level folder stripped.
+
+    Returns the package's base64 SHA-256.
+    """
+    with zipfile.ZipFile(archive_path, 'r') as source, \
+            zipfile.ZipFile(package_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as output:
+        for file_info in sorted(source.infolist(), key=lambda info: info.filename):
+            clean_name = strip_archive_prefix(file_info.filename)
+            if file_info.is_dir() or not clean_name:
+                continue
+
+            entry = zipfile.ZipInfo(clean_name, date_time=ZIP_EPOCH)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            executable = (file_info.external_attr >> 16) & 0o111
+            entry.external_attr = (0o100755 if executable else 0o100644) << 16
+            # Copy member by member in chunks so large files never sit in memory whole
+            with source.open(file_info) as src, output.open(entry, 'w') as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    return file_sha256(package_path)
+
+def file_sha256(path: str) -> str:
+    """Base64 SHA-256 of a file, read in chunks, in the same form as Lambda's CodeSha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode('ascii')
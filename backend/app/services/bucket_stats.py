@@ -0,0 +1,91 @@
+import heapq
+from datetime import datetime
+from typing import Dict, List, Tuple
+from app.models.aws_models import BucketStats, StorageUsage
+
+# Upper bound (exclusive) and label of each object size histogram bucket
+SIZE_HISTOGRAM_BUCKETS = [
+    (1024, '<1KB'),
+    (1024 ** 2, '1KB-1MB'),
+    (16 * 1024 ** 2, '1MB-16MB'),
+    (128 * 1024 ** 2, '16MB-128MB'),
+    (1024 ** 3, '128MB-1GB'),
+    (None, '>=1GB')
+]
+
+class BucketStatsAggregator:
+    """Constant-memory running totals over a stream of list_objects_v2 entries"""
+
+    def __init__(self, prefix_depth: int = 1, top_n: int = 10):
+        self.prefix_depth = prefix_depth
+        self.top_n = top_n
+        self.object_count = 0
+        self.total_bytes = 0
+        self.storage_classes: Dict[str, List[int]] = {}
+        self.size_histogram: Dict[str, int] = {label: 0 for _, label in SIZE_HISTOGRAM_BUCKETS}
+        self.prefixes: Dict[str, List[int]] = {}
+        self._largest: List[Tuple[int, str]] = []  # min-heap of (size, key)
+
+    def add(self, obj: dict):
+        """Fold one listed object into the aggregates"""
+        key, size = obj['Key'], obj.get('Size', 0)
+        self.object_count += 1
+        self.total_bytes += size
+        self._add_usage(self.storage_classes, obj.get('StorageClass', 'STANDARD'), 1, size)
+        self._add_usage(self.prefixes, self._prefix_of(key), 1, size)
+
+        for upper_bound, label in SIZE_HISTOGRAM_BUCKETS:
+            if upper_bound is None or size < upper_bound:
+                self.size_histogram[label] += 1
+                break
+
+        if len(self._largest) < self.top_n:
+            heapq.heappush(self._largest, (size, key))
+        elif size > self._largest[0][0]:
+            heapq.heapreplace(self._largest, (size, key))
+
+    def merge(self, other: 'BucketStatsAggregator'):
+        """Fold the aggregates of another walk (e.g. a different prefix) into this one"""
+        self.object_count += other.object_count
+        self.total_bytes += other.total_bytes
+        for storage_class, (count, size) in other.storage_classes.items():
+            self._add_usage(self.storage_classes, storage_class, count, size)
+        for prefix, (count, size) in other.prefixes.items():
+            self._add_usage(self.prefixes, prefix, count, size)
+        for label, count in other.size_histogram.items():
+            self.size_histogram[label] += count
+        for entry in other._largest:
+            if len(self._largest) < self.top_n:
+                heapq.heappush(self._largest, entry)
+            elif entry[0] > self._largest[0][0]:
+                heapq.heapreplace(self._largest, entry)
+
+    def to_stats(self, bucket: str) -> BucketStats:
+        """Build the BucketStats model for the aggregated objects"""
+        return BucketStats(
+            bucket=bucket,
+            object_count=self.object_count,
+            total_bytes=self.total_bytes,
+            storage_classes={
+                name: StorageUsage(object_count=count, total_bytes=size)
+                for name, (count, size) in self.storage_classes.items()
+            },
+            size_histogram=self.size_histogram,
+            largest_objects=[{'key': key, 'size': size} for size, key in sorted(self._largest, reverse=True)],
+            prefix_depth=self.prefix_depth,
+            prefixes={
+                prefix: StorageUsage(object_count=count, total_bytes=size)
+                for prefix, (count, size) in sorted(self.prefixes.items())
+            },
+            computed_at=datetime.now()
+        )
+
+    def _prefix_of(self, key: str) -> str:
+        """Roll a key up to its folder at the configured depth ('' for top-level keys)"""
+        folders = key.split('/')[:-1][:self.prefix_depth]
+        return '/'.join(folders) + '/' if folders else ''
+
+    def _add_usage(self, usage: Dict[str, List[int]], name: str, count: int, size: int):
+        totals = usage.setdefault(name, [0, 0])
+        totals[0] += count
+        totals[1] += size
@@ -0,0 +1,84 @@
+import asyncio
+import heapq
+import itertools
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Environments that jump ahead of previews and other environments in the queue
+PRIORITY_ENVIRONMENTS = {'production', 'prod'}
+
+class DeploymentQueue:
+    """Runs queued deployments in the background with global and per-target concurrency caps"""
+
+    def __init__(self):
+        self.max_concurrency = int(os.getenv('DEPLOY_MAX_CONCURRENCY', '4'))
+        self.target_concurrency = int(os.getenv('DEPLOY_TARGET_CONCURRENCY', '2'))
+        self._pending: List[Tuple[int, int, str]] = []  # heap of (priority, sequence, deployment id)
+        self._queued: Dict[str, Tuple[str, Callable[[], Awaitable[Any]]]] = {}
+        self._running: Dict[str, Tuple[str, asyncio.Task]] = {}
+        self._sequence = itertools.count()
+
+    def submit(self, deployment_id: str, target: str, environment: str, work: Callable[[], Awaitable[Any]]):
+        """Queue work(); production deploys are started before everything else"""
+        priority = 0 if environment.lower() in PRIORITY_ENVIRONMENTS else 1
+        heapq.heappush(self._pending, (priority, next(self._sequence), deployment_id))
+        self._queued[deployment_id] = (target, work)
+        self._dispatch()
+
+    def cancel(self, deployment_id: str) -> bool:
+        """Drop a queued deployment or cancel a running one; False if it is not active"""
+        if self._queued.pop(deployment_id, None) is not None:
+            # The stale heap entry is skipped when it reaches the top
+            return True
+        running = self._running.get(deployment_id)
+        if running is not None:
+            running[1].cancel()
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and running deployments per target"""
+        running_by_target: Dict[str, int] = {}
+        for target, _ in self._running.values():
+            running_by_target[target] = running_by_target.get(target, 0) + 1
+        return {
+            'queued': len(self._queued),
+            'running': len(self._running),
+            'running_by_target': running_by_target,
+            'max_concurrency': self.max_concurrency,
+            'target_concurrency': self.target_concurrency
+        }
+
+    def _dispatch(self):
+        """Start the highest-priority queued deployments that fit under the caps"""
+        skipped = []
+        while self._pending and len(self._running) < self.max_concurrency:
+            entry = heapq.heappop(self._pending)
+            deployment_id = entry[2]
+            if deployment_id not in self._queued:
+                continue
+            target, work = self._queued[deployment_id]
+            if self._running_for(target) >= self.target_concurrency:
+                # Target is saturated; let lower-priority work for other targets through
+                skipped.append(entry)
+                continue
+
+            del self._queued[deployment_id]
+            task = asyncio.create_task(work())
+            self._running[deployment_id] = (target, task)
+            task.add_done_callback(lambda _, deployment_id=deployment_id: self._finished(deployment_id))
+
+        for entry in skipped:
+            heapq.heappush(self._pending, entry)
+
+    def _finished(self, deployment_id: str):
+        self._running.pop(deployment_id, None)
+        self._dispatch()
+
+    def _running_for(self, target: str) -> int:
+        return sum(1 for running_target, _ in self._running.values() if running_target == target)
+
+deployment_queue = DeploymentQueue()
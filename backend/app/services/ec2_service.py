@@ -1,47 +1,217 @@
-from typing import List
+import asyncio
+import functools
+import os
+import re
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterator, List
 from app.aws_client import aws_client
-from app.models.aws_models import EC2Instance, CreateEC2Request
+from app.executor import executor
+from app.fanout import region_fanout
+from app.models.aws_models import (
+    EC2Instance, EC2InstanceFilter, EC2Inventory, EC2InstancePage, CreateEC2Request,
+    InstanceRef, BatchOperationResult
+)
+from app.pagination import encode_cursor, decode_cursor
 import boto3
 from botocore.exceptions import ClientError
 
+# StartInstances, StopInstances and TerminateInstances accept up to 1000 IDs per call
+EC2_BATCH_CHUNK_SIZE = 1000
+
+# Errors caused by specific instances in a batch call (the InvalidInstanceID.* family is matched by prefix)
+EC2_PER_INSTANCE_ERROR_CODES = {'IncorrectInstanceState', 'OperationNotPermitted'}
+
+# Client method and response key holding the state changes for each batch action
+EC2_BATCH_ACTIONS = {
+    'start': ('start_instances', 'StartingInstances'),
+    'stop': ('stop_instances', 'StoppingInstances'),
+    'terminate': ('terminate_instances', 'TerminatingInstances')
+}
+
 class EC2Service:
     def __init__(self):
         pass
 
-    async def list_instances(self, region: str = None) -> List[EC2Instance]:
+    async def list_instances(self, region: str = None, filters: EC2InstanceFilter = None) -> List[EC2Instance]:
         """List all EC2 instances in specified region or all regions"""
-        try:
-            instances = []
-            regions_to_check = [region] if region else aws_client.get_all_regions()
-            
-            for current_region in regions_to_check:
-                try:
-                    ec2_client = aws_client.get_client('ec2', current_region)
-                    response = ec2_client.describe_instances()
-                    
-                    for reservation in response['Reservations']:
-                        for instance in reservation['Instances']:
-                            tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-                            
-                            ec2_instance = EC2Instance(
-                                instance_id=instance['InstanceId'],
-                                instance_type=instance['InstanceType'],
-                                state=instance['State']['Name'],
-                                public_ip=instance.get('PublicIpAddress'),
-                                private_ip=instance.get('PrivateIpAddress'),
-                                launch_time=instance.get('LaunchTime'),
-                                tags=tags,
-                                region=current_region
-                            )
-                            instances.append(ec2_instance)
-                except Exception as e:
-                    # Skip regions where we don't have access or service isn't available
-                    print(f"Skipping region {current_region}: {str(e)}")
-                    continue
-            
-            return instances
-        except ClientError as e:
-            raise Exception(f"Error listing EC2 instances: {str(e)}")
+        inventory = await self.list_inventory(region, filters)
+        return inventory.instances
+
+    async def list_inventory(self, region: str = None, filters: EC2InstanceFilter = None) -> EC2Inventory:
+        """List EC2 instances across regions concurrently, with per-region status"""
+        regions_to_check = [region] if region else aws_client.get_all_regions()
+        iter_pages = functools.partial(self._iter_instance_pages, filters=filters)
+        results, statuses = await region_fanout.collect(iter_pages, regions_to_check, raise_if_all_fail=True)
+
+        instances = []
+        for current_region in regions_to_check:
+            for page in results.get(current_region, []):
+                instances.extend(page)
+
+        return EC2Inventory(instances=instances, regions=statuses)
+
+    async def stream_instances(self, region: str = None, filters: EC2InstanceFilter = None) -> AsyncIterator[EC2Instance]:
+        """Yield EC2 instances as each region and page arrives"""
+        regions_to_check = [region] if region else aws_client.get_all_regions()
+        iter_pages = functools.partial(self._iter_instance_pages, filters=filters)
+        async for _, page in region_fanout.stream(iter_pages, regions_to_check, raise_if_all_fail=True):
+            for instance in page:
+                yield instance
+
+    async def list_instances_page(
+        self,
+        region: str = None,
+        cursor: str = None,
+        page_size: int = 100,
+        filters: EC2InstanceFilter = None
+    ) -> EC2InstancePage:
+        """List one page of EC2 instances, resuming from an opaque cursor"""
+        regions_to_check = [region] if region else aws_client.get_all_regions()
+        state = decode_cursor(cursor) if cursor else {'region_index': 0}
+        region_index = state.get('region_index', 0)
+        next_token = state.get('next_token')
+        # Instances of the next_token page already returned, when the previous page ended part way through it
+        skip = state.get('skip', 0)
+        if not (self._is_count(region_index) and region_index < len(regions_to_check)
+                and self._is_count(skip) and (next_token is None or isinstance(next_token, str))):
+            raise ValueError("Invalid pagination cursor")
+        aws_filters = self._build_filters(filters)
+
+        instances = []
+        while region_index < len(regions_to_check) and len(instances) < page_size:
+            current_region = regions_to_check[region_index]
+            room = page_size - len(instances)
+            # describe_instances accepts MaxResults between 5 and 1000
+            params = {'MaxResults': max(5, min(skip + room, 1000))}
+            if aws_filters:
+                params['Filters'] = aws_filters
+            if next_token:
+                params['NextToken'] = next_token
+
+            try:
+                ec2_client = aws_client.get_client('ec2', current_region)
+                response = await executor.run_aws(ec2_client.describe_instances, **params)
+            except Exception:
+                if region:
+                    raise
+                # Skip regions where we don't have access or service isn't available
+                region_index, next_token, skip = region_index + 1, None, 0
+                continue
+
+            page = [
+                self._to_instance(instance, current_region)
+                for reservation in response['Reservations']
+                for instance in reservation['Instances']
+                if self._in_launch_window(instance, filters)
+            ][skip:]
+            if len(page) > room:
+                # Return only page_size instances and resume from the same AWS page past them
+                instances.extend(page[:room])
+                skip += room
+                break
+
+            instances.extend(page)
+            next_token, skip = response.get('NextToken'), 0
+            if not next_token:
+                region_index += 1
+
+        next_cursor = None
+        if region_index < len(regions_to_check):
+            state = {'region_index': region_index, 'next_token': next_token}
+            if skip:
+                state['skip'] = skip
+            next_cursor = encode_cursor(state)
+        return EC2InstancePage(instances=instances, next_cursor=next_cursor)
+
+    @staticmethod
+    def _is_count(value) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+    def _iter_instance_pages(self, region: str, filters: EC2InstanceFilter = None) -> Iterator[List[EC2Instance]]:
+        """Iterate describe_instances pages in a single region"""
+        ec2_client = aws_client.get_client('ec2', region)
+        paginator = ec2_client.get_paginator('describe_instances')
+
+        params = {}
+        aws_filters = self._build_filters(filters)
+        if aws_filters:
+            params['Filters'] = aws_filters
+        if filters and filters.max_results:
+            params['PaginationConfig'] = {'PageSize': filters.max_results}
+
+        for page in paginator.paginate(**params):
+            yield [
+                self._to_instance(instance, region)
+                for reservation in page['Reservations']
+                for instance in reservation['Instances']
+                if self._in_launch_window(instance, filters)
+            ]
+
+    def _build_filters(self, filters: EC2InstanceFilter = None) -> List[dict]:
+        """Translate an EC2InstanceFilter into describe_instances Filters"""
+        if not filters:
+            return []
+
+        aws_filters = []
+        if filters.states:
+            aws_filters.append({'Name': 'instance-state-name', 'Values': filters.states})
+        if filters.instance_types:
+            aws_filters.append({'Name': 'instance-type', 'Values': filters.instance_types})
+        for key, value in (filters.tags or {}).items():
+            if value:
+                aws_filters.append({'Name': f'tag:{key}', 'Values': [value]})
+            else:
+                aws_filters.append({'Name': 'tag-key', 'Values': [key]})
+        if filters.vpc_id:
+            aws_filters.append({'Name': 'vpc-id', 'Values': [filters.vpc_id]})
+        if filters.subnet_id:
+            aws_filters.append({'Name': 'subnet-id', 'Values': [filters.subnet_id]})
+
+        # launch-time only supports wildcards, so push down the prefix both bounds share
+        if filters.launched_after and filters.launched_before:
+            prefix = os.path.commonprefix([
+                self._as_utc(filters.launched_after).strftime('%Y-%m-%dT%H:%M:%S'),
+                self._as_utc(filters.launched_before).strftime('%Y-%m-%dT%H:%M:%S')
+            ])
+            if prefix:
+                aws_filters.append({'Name': 'launch-time', 'Values': [f'{prefix}*']})
+
+        return aws_filters
+
+    def _in_launch_window(self, instance: dict, filters: EC2InstanceFilter = None) -> bool:
+        """Check the exact launch-time range that the wildcard filter can only narrow down"""
+        if not filters or not (filters.launched_after or filters.launched_before):
+            return True
+        launch_time = instance.get('LaunchTime')
+        if launch_time is None:
+            return False
+        launch_time = self._as_utc(launch_time)
+        if filters.launched_after and launch_time < self._as_utc(filters.launched_after):
+            return False
+        if filters.launched_before and launch_time > self._as_utc(filters.launched_before):
+            return False
+        return True
+
+    def _as_utc(self, value: datetime) -> datetime:
+        """Treat naive datetimes as UTC"""
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def _to_instance(self, instance: dict, region: str) -> EC2Instance:
+        """Convert a describe_instances entry into an EC2Instance"""
+        tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
+
+        return EC2Instance(
+            instance_id=instance['InstanceId'],
+            instance_type=instance['InstanceType'],
+            state=instance['State']['Name'],
+            public_ip=instance.get('PublicIpAddress'),
+            private_ip=instance.get('PrivateIpAddress'),
+            launch_time=instance.get('LaunchTime'),
+            tags=tags,
+            region=region
+        )
 
     async def create_instance(self, request: CreateEC2Request, region: str = None) -> dict:
         """Create a new EC2 instance in specified region"""
@@ -68,7 +238,7 @@ class EC2Service:
                 }]
                 params['TagSpecifications'] = tag_specifications
             
-            response = ec2_client.run_instances(**params)
+            response = await executor.run_aws(ec2_client.run_instances, **params)
             return response['Instances'][0]
         except ClientError as e:
             raise Exception(f"Error creating EC2 instance: {str(e)}")
@@ -77,7 +247,7 @@ class EC2Service:
         """Terminate an EC2 instance"""
         try:
             ec2_client = aws_client.get_client('ec2', region)
-            response = ec2_client.terminate_instances(InstanceIds=[instance_id])
+            response = await executor.run_aws(ec2_client.terminate_instances, InstanceIds=[instance_id])
             return response
         except ClientError as e:
             raise Exception(f"Error terminating EC2 instance: {str(e)}")
@@ -86,7 +256,7 @@ class EC2Service:
         """Start an EC2 instance"""
         try:
             ec2_client = aws_client.get_client('ec2', region)
-            response = ec2_client.start_instances(InstanceIds=[instance_id])
+            response = await executor.run_aws(ec2_client.start_instances, InstanceIds=[instance_id])
             return response
         except ClientError as e:
             raise Exception(f"Error starting EC2 instance: {str(e)}")
@@ -95,11 +265,107 @@ class EC2Service:
         """Stop an EC2 instance"""
         try:
             ec2_client = aws_client.get_client('ec2', region)
-            response = ec2_client.stop_instances(InstanceIds=[instance_id])
+            response = await executor.run_aws(ec2_client.stop_instances, InstanceIds=[instance_id])
             return response
         except ClientError as e:
             raise Exception(f"Error stopping EC2 instance: {str(e)}")
 
+    async def batch_instance_action(self, action: str, instances: List[InstanceRef]) -> List[BatchOperationResult]:
+        """Start, stop or terminate many instances, grouped by region and run concurrently"""
+        if action not in EC2_BATCH_ACTIONS:
+            raise ValueError(f"Unsupported batch action: {action}")
+
+        instance_ids_by_region: Dict[str, List[str]] = {}
+        for ref in instances:
+            region_ids = instance_ids_by_region.setdefault(ref.region or aws_client.default_region, [])
+            if ref.instance_id not in region_ids:
+                region_ids.append(ref.instance_id)
+
+        semaphore = asyncio.Semaphore(region_fanout.concurrency)
+
+        async def apply_action(region: str) -> List[BatchOperationResult]:
+            instance_ids = instance_ids_by_region[region]
+            async with semaphore:
+                try:
+                    return await self._apply_region_action(action, region, instance_ids)
+                except Exception as e:
+                    return [
+                        BatchOperationResult(instance_id=instance_id, region=region, success=False, error=str(e))
+                        for instance_id in instance_ids
+                    ]
+
+        region_results = await asyncio.gather(*(apply_action(region) for region in instance_ids_by_region))
+        return [result for results in region_results for result in results]
+
+    async def _apply_region_action(self, action: str, region: str, instance_ids: List[str]) -> List[BatchOperationResult]:
+        """Apply a batch action to the instances of one region in API-sized chunks"""
+        ec2_client = aws_client.get_client('ec2', region)
+        operation_name, result_key = EC2_BATCH_ACTIONS[action]
+        operation = getattr(ec2_client, operation_name)
+
+        results = []
+        for i in range(0, len(instance_ids), EC2_BATCH_CHUNK_SIZE):
+            results.extend(await self._apply_chunk(operation, result_key, region, instance_ids[i:i + EC2_BATCH_CHUNK_SIZE]))
+        return results
+
+    async def _apply_chunk(self, operation, result_key: str, region: str, instance_ids: List[str]) -> List[BatchOperationResult]:
+        """Apply one API call to a chunk of instance IDs, each call under its own timeout"""
+        try:
+            response = await executor.run_aws(operation, InstanceIds=instance_ids)
+        except TimeoutError as e:
+            # The call is still running in its worker thread, so the action may yet be applied
+            error = f"{e}; the action may still have been applied"
+            return [BatchOperationResult(instance_id=instance_id, region=region, success=False, error=error)
+                    for instance_id in instance_ids]
+        except ClientError as e:
+            if len(instance_ids) == 1 or not self._is_per_instance_error(e):
+                return [BatchOperationResult(instance_id=instance_id, region=region, success=False, error=str(e))
+                        for instance_id in instance_ids]
+            # One bad ID fails the whole call. Errors name the offending IDs, so fail those and retry the rest
+            # as one call; if none are named, bisect so a single bad ID costs O(log n) calls rather than n.
+            named = set(re.findall(r'[\w.-]+', e.response.get('Error', {}).get('Message', '')))
+            bad_ids = [instance_id for instance_id in instance_ids if instance_id in named]
+            if bad_ids and len(bad_ids) < len(instance_ids):
+                results = [BatchOperationResult(instance_id=instance_id, region=region, success=False, error=str(e))
+                           for instance_id in bad_ids]
+                rest = [instance_id for instance_id in instance_ids if instance_id not in named]
+                results += await self._apply_chunk(operation, result_key, region, rest)
+                by_id = {result.instance_id: result for result in results}
+                return [by_id[instance_id] for instance_id in instance_ids]
+            if bad_ids:
+                return [BatchOperationResult(instance_id=instance_id, region=region, success=False, error=str(e))
+                        for instance_id in instance_ids]
+            middle = len(instance_ids) // 2
+            halves = await asyncio.gather(
+                self._apply_chunk(operation, result_key, region, instance_ids[:middle]),
+                self._apply_chunk(operation, result_key, region, instance_ids[middle:])
+            )
+            return halves[0] + halves[1]
+
+        changes = {change['InstanceId']: change for change in response.get(result_key, [])}
+        results = []
+        for instance_id in instance_ids:
+            change = changes.get(instance_id)
+            if change is None:
+                results.append(BatchOperationResult(
+                    instance_id=instance_id, region=region, success=False, error="Instance missing from response"
+                ))
+                continue
+            results.append(BatchOperationResult(
+                instance_id=instance_id,
+                region=region,
+                success=True,
+                previous_state=change['PreviousState']['Name'],
+                current_state=change['CurrentState']['Name']
+            ))
+        return results
+
+    def _is_per_instance_error(self, error: ClientError) -> bool:
+        """Whether an error is caused by particular instances, so retrying IDs one by one can attribute it.
+        Throttling and other call-wide errors are not, and one-by-one retries would only multiply them."""
+        code = error.response.get('Error', {}).get('Code', '')
+        return code.startswith('InvalidInstanceID.') or code in EC2_PER_INSTANCE_ERROR_CODES
+
     async def get_regions(self) -> List[str]:
         """Get all available AWS regions"""
         return aws_client.get_all_regions()
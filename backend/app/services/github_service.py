@@ -1,97 +1,187 @@
+import asyncio
+import hashlib
+import re
+import tempfile
+import time
 import requests
 import boto3
 import json
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from app.models.github_models import GitHubRepository, DeploymentConfig, Deployment
+from app.models.github_models import GitHubRepository, DeploymentConfig, Deployment, RepositoryTreeEntry
 from app.aws_client import aws_client
+from app.executor import executor
+from app.github_client import github_client
+from app.cache import ArtifactCache
+from app.services.deployment_queue import deployment_queue
+from app.services.static_site import static_site_uploader
+from app.services.repo_tree import RepositoryTree, RepositoryTreeCache
+from app.services.lambda_deploy import (
+    alias_name, package_size, lambda_code_uploader, lambda_deploy_queue
+)
+from app.services.archive_tasks import file_sha256, repack_archive
 import base64
-import zipfile
-import io
 import os
 
+# Largest page size /user/repos accepts
+REPOS_PER_PAGE = 100
+
+# Read size when streaming repository archives
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
 class GitHubService:
     def __init__(self):
-        self.base_url = "https://api.github.com"
+        self.base_url = github_client.base_url
+        self.page_concurrency = int(os.getenv('GITHUB_PAGE_CONCURRENCY', '4'))
+        self.repo_cache_ttl = float(os.getenv('GITHUB_REPO_CACHE_TTL', '60'))
+        self._repo_cache: Dict[str, Tuple[float, List[GitHubRepository]]] = {}
+        self.tree_cache = RepositoryTreeCache(int(os.getenv('GITHUB_TREE_CACHE_SIZE', '64')))
+        self.archive_spool_size = int(os.getenv('GITHUB_ARCHIVE_SPOOL_SIZE', str(32 * 1024 * 1024)))
         
-    def get_user_repositories(self, access_token: str) -> List[GitHubRepository]:
-        """Get user's GitHub repositories"""
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+    async def get_user_repositories(self, access_token: str) -> List[GitHubRepository]:
+        """Get all of the user's GitHub repositories, in GitHub's order"""
+        pages = [page async for page in self._iter_repository_pages(access_token)]
+        return [repo for _, repos in sorted(pages, key=lambda page: page[0]) for repo in repos]
+    
+    async def stream_user_repositories(self, access_token: str) -> AsyncIterator[GitHubRepository]:
+        """Yield the user's GitHub repositories as each page arrives"""
+        async for _, repos in self._iter_repository_pages(access_token):
+            for repo in repos:
+                yield repo
+    
+    async def _iter_repository_pages(self, access_token: str) -> AsyncIterator[Tuple[int, List[GitHubRepository]]]:
+        """Yield (page number, repos); the first page tells how many more to fetch concurrently"""
+        cache_key = hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+        cached = self._repo_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.repo_cache_ttl:
+            yield 1, cached[1]
+            return
         
         try:
-            response = requests.get(f"{self.base_url}/user/repos", headers=headers)
-            response.raise_for_status()
+            first_page, headers = await executor.run_github(self._get_repository_page, access_token, 1)
+            pages = {1: first_page}
+            yield 1, first_page
             
-            repos = []
-            for repo_data in response.json():
-                repo = GitHubRepository(
-                    id=repo_data["id"],
-                    name=repo_data["name"],
-                    full_name=repo_data["full_name"],
-                    description=repo_data.get("description"),
-                    html_url=repo_data["html_url"],
-                    clone_url=repo_data["clone_url"],
-                    ssh_url=repo_data["ssh_url"],
-                    default_branch=repo_data["default_branch"],
-                    language=repo_data.get("language"),
-                    private=repo_data["private"],
-                    created_at=datetime.fromisoformat(repo_data["created_at"].replace("Z", "+00:00")),
-                    updated_at=datetime.fromisoformat(repo_data["updated_at"].replace("Z", "+00:00"))
-                )
-                repos.append(repo)
+            semaphore = asyncio.Semaphore(self.page_concurrency)
             
-            return repos
+            async def fetch(page: int) -> Tuple[int, List[GitHubRepository]]:
+                async with semaphore:
+                    repos, _ = await executor.run_github(self._get_repository_page, access_token, page)
+                return page, repos
+            
+            tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, self._last_page(headers) + 1)]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    page, repos = await task
+                    pages[page] = repos
+                    yield page, repos
+            finally:
+                for task in tasks:
+                    task.cancel()
+            
+            self._repo_cache[cache_key] = (
+                time.monotonic(), [repo for page in sorted(pages) for repo in pages[page]]
+            )
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch repositories: {str(e)}")
     
+    def _get_repository_page(self, access_token: str, page: int) -> Tuple[List[GitHubRepository], Dict[str, str]]:
+        """Fetch one page of /user/repos"""
+        repos_data, headers = github_client.get_json(
+            access_token, "/user/repos", params={'per_page': REPOS_PER_PAGE, 'page': page}
+        )
+        return [GitHubRepository.model_validate(repo_data) for repo_data in repos_data], headers
+    
+    def _last_page(self, headers: Dict[str, str]) -> int:
+        """Read the last page number from a Link header, 1 if there is only one page"""
+        match = re.search(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"', headers.get('Link', ''))
+        return int(match.group(1)) if match else 1
+    
     def get_repository_content(self, access_token: str, repo_full_name: str, path: str = "") -> Dict[str, Any]:
         """Get repository content"""
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        
         try:
-            url = f"{self.base_url}/repos/{repo_full_name}/contents/{path}"
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+            content, _ = github_client.get_json(access_token, f"/repos/{repo_full_name}/contents/{path}")
+            return content
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch repository content: {str(e)}")
     
-    def download_repository_archive(self, access_token: str, repo_full_name: str, branch: str = "main") -> bytes:
-        """Download repository as ZIP archive"""
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+    def resolve_commit(self, access_token: str, repo_full_name: str, ref: str = "HEAD") -> Dict[str, str]:
+        """Resolve a branch, tag or SHA to its commit SHA and root tree SHA"""
+        try:
+            commit, _ = github_client.get_json(access_token, f"/repos/{repo_full_name}/commits/{ref}")
+            return {'commit_sha': commit['sha'], 'tree_sha': commit['commit']['tree']['sha']}
+        except requests.RequestException as e:
+            raise Exception(f"Failed to resolve {ref}: {str(e)}")
+    
+    def get_repository_tree(self, access_token: str, repo_full_name: str, ref: str = "HEAD") -> Tuple[Dict[str, str], RepositoryTree]:
+        """Get the full recursive file listing of a ref in one call, cached by tree SHA"""
+        commit = self.resolve_commit(access_token, repo_full_name, ref)
+        tree = self.tree_cache.get(commit['tree_sha'])
+        if tree is not None:
+            return commit, tree
+        
+        try:
+            tree_data, _ = github_client.get_json(
+                access_token, f"/repos/{repo_full_name}/git/trees/{commit['tree_sha']}", params={'recursive': 1}
+            )
+        except requests.RequestException as e:
+            raise Exception(f"Failed to fetch repository tree: {str(e)}")
         
+        tree = RepositoryTree(
+            commit['tree_sha'],
+            [RepositoryTreeEntry.model_validate(entry) for entry in tree_data['tree']],
+            truncated=tree_data.get('truncated', False)
+        )
+        self.tree_cache.set(tree)
+        return commit, tree
+    
+    def download_repository_archive(self, access_token: str, repo_full_name: str, branch: str = "main") -> BinaryIO:
+        """Download repository as ZIP archive, streamed into a spooled temporary file"""
+        # Small archives stay in memory, large ones roll over to disk instead of growing RSS
+        archive = tempfile.SpooledTemporaryFile(max_size=self.archive_spool_size)
         try:
-            url = f"{self.base_url}/repos/{repo_full_name}/zipball/{branch}"
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.content
+            with github_client.get(access_token, f"/repos/{repo_full_name}/zipball/{branch}", stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=ARCHIVE_CHUNK_SIZE):
+                    archive.write(chunk)
+            archive.seek(0)
+            return archive
         except requests.RequestException as e:
+            archive.close()
             raise Exception(f"Failed to download repository: {str(e)}")
 
+# Files that can provide the index.handler entry point, by runtime family
+LAMBDA_HANDLER_FILES = {
+    'python': ['index.py'],
+    'nodejs': ['index.js', 'index.mjs', 'index.cjs']
+}
+
 class DeploymentService:
-    def __init__(self):
-        self.github_service = GitHubService()
+    def __init__(self, github_service: GitHubService):
+        # Shared with the API routes, so pre-deploy validation and /tree use one tree index and response cache
+        self.github_service = github_service
         self.deployments = {}  # In production, use a database
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self.artifact_cache = ArtifactCache(
+            os.getenv('DEPLOY_ARTIFACT_CACHE_DIR', '.cache/artifacts'),
+            int(os.getenv('DEPLOY_ARTIFACT_CACHE_MAX_BYTES', str(2 * 1024 ** 3)))
+        )
         
     async def create_deployment(self, access_token: str, config: DeploymentConfig) -> Deployment:
         """Create a new deployment"""
         deployment_id = str(uuid.uuid4())
         
+        # Pin the deployment to the exact commit the branch points at right now
+        commit = await executor.run_github(
+            self.github_service.resolve_commit, access_token, config.repository_name, config.branch
+        )
+        
         deployment = Deployment(
             id=deployment_id,
             repository_name=config.repository_name,
             branch=config.branch,
-            commit_sha="latest",  # In production, get actual commit SHA
+            commit_sha=commit['commit_sha'],
             aws_service=config.aws_service,
             status="pending",
             created_at=datetime.now()
@@ -99,64 +189,125 @@ class DeploymentService:
         
         self.deployments[deployment_id] = deployment
         
-        # Start deployment process
-        if config.aws_service == "lambda":
-            await self._deploy_to_lambda(access_token, config, deployment)
-        elif config.aws_service == "s3-static":
-            await self._deploy_to_s3_static(access_token, config, deployment)
-        elif config.aws_service == "ec2":
-            await self._deploy_to_ec2(access_token, config, deployment)
+        # Queue the deployment; it runs in the background and clients poll its status
+        deployment_queue.submit(
+            deployment_id, config.aws_service, config.environment,
+            lambda: self._run_deployment(access_token, config, deployment)
+        )
         
         return deployment
     
+    async def _run_deployment(self, access_token: str, config: DeploymentConfig, deployment: Deployment):
+        """Run a queued deployment through to a final status"""
+        try:
+            if config.aws_service == "lambda":
+                await self._deploy_to_lambda(access_token, config, deployment)
+            elif config.aws_service == "s3-static":
+                await self._deploy_to_s3_static(access_token, config, deployment)
+            elif config.aws_service == "ec2":
+                await self._deploy_to_ec2(access_token, config, deployment)
+            else:
+                deployment.status = "failed"
+                deployment.completed_at = datetime.now()
+                deployment.logs = f"Unsupported deployment target: {config.aws_service}\n"
+        except asyncio.CancelledError:
+            deployment.status = "cancelled"
+            deployment.completed_at = datetime.now()
+            deployment.logs = (deployment.logs or "") + "Deployment cancelled\n"
+    
+    def cancel_deployment(self, deployment_id: str) -> Optional[Deployment]:
+        """Cancel a queued or running deployment"""
+        deployment = self.deployments.get(deployment_id)
+        if deployment is None:
+            return None
+        if not deployment_queue.cancel(deployment_id):
+            raise ValueError(f"Deployment is already {deployment.status}")
+        if deployment.status == "pending":
+            # Never started, so nothing else will record the cancellation
+            deployment.status = "cancelled"
+            deployment.completed_at = datetime.now()
+            deployment.logs = "Deployment cancelled before it started\n"
+        return deployment
+    
     async def _deploy_to_lambda(self, access_token: str, config: DeploymentConfig, deployment: Deployment):
         """Deploy to AWS Lambda"""
         try:
             deployment.status = "building"
-            deployment.logs = "Downloading repository...\n"
+            deployment.logs = "Validating repository...\n"
+            await self._validate_repository(access_token, config, deployment.commit_sha)
             
-            # Download repository
-            repo_archive = self.github_service.download_repository_archive(
-                access_token, config.repository_name, config.branch
-            )
+            package_sha256 = None
             
-            deployment.logs += "Creating Lambda function...\n"
+            async def build() -> BinaryIO:
+                nonlocal package_sha256
+                package, package_sha256 = await self._build_lambda_package(access_token, config, deployment)
+                return package
             
-            # Create Lambda function
-            lambda_client = aws_client.get_client('lambda')
+            # The package is a pure function of the commit, so a cached one skips download and build
+            package, cached = await self._produce_once((config.repository_name, deployment.commit_sha, 'lambda'), build)
+            if cached:
+                deployment.logs += f"Using cached Lambda package for {deployment.commit_sha[:7]}\n"
+            if package_sha256 is None:
+                # Built earlier or by a concurrent deploy, so hash the package on disk
+                package_sha256 = await executor.run_cpu(file_sha256, package.name)
+            deployment.logs += f"Package is {package_size(package)} bytes, CodeSha256 {package_sha256}\n"
             
+            lambda_client = aws_client.get_client('lambda')
             function_name = f"{config.repository_name.replace('/', '-')}-{config.environment}"
             
-            # Prepare the deployment package
-            zip_buffer = io.BytesIO(repo_archive)
-            
-            lambda_params = {
-                'FunctionName': function_name,
-                'Runtime': config.runtime or 'python3.9',
-                'Role': self._get_lambda_execution_role(),
-                'Handler': 'index.handler',
-                'Code': {'ZipFile': repo_archive},
-                'Environment': {
-                    'Variables': config.environment_variables or {}
-                },
-                'Description': f'Deployed from {config.repository_name}'
-            }
-            
-            try:
-                response = lambda_client.create_function(**lambda_params)
-            except lambda_client.exceptions.ResourceConflictException:
-                # Function exists, update it
-                response = lambda_client.update_function_code(
-                    FunctionName=function_name,
-                    ZipFile=repo_archive
-                )
-                lambda_client.update_function_configuration(
-                    FunctionName=function_name,
-                    Runtime=config.runtime or 'python3.9',
-                    Environment={
-                        'Variables': config.environment_variables or {}
+            async def apply():
+                # Runs with no other deploy to this function in flight
+                deployment.status = "deploying"
+                deployment.logs += f"Deploying to {function_name}...\n"
+                configuration = await lambda_deploy_queue.wait_until_ready(lambda_client, function_name)
+                
+                if configuration is None:
+                    deployment.logs += "Creating Lambda function...\n"
+                    code = await lambda_code_uploader.code_location(package, package_sha256=package_sha256)
+                    lambda_params = {
+                        'FunctionName': function_name,
+                        'Runtime': config.runtime or 'python3.9',
+                        'Role': self._get_lambda_execution_role(),
+                        'Handler': 'index.handler',
+                        'Code': code,
+                        'Environment': {
+                            'Variables': config.environment_variables or {}
+                        },
+                        'Description': f'Deployed from {config.repository_name}'
                     }
+                    await executor.run_aws(lambda_client.create_function, **lambda_params)
+                else:
+                    # Function exists, only ship code when its content hash changed
+                    response = await lambda_code_uploader.update_code(
+                        lambda_client, function_name, package, current_sha256=configuration['CodeSha256'],
+                        package_sha256=package_sha256
+                    )
+                    if response is None:
+                        deployment.logs += "Code unchanged, skipping upload\n"
+                    else:
+                        deployment.logs += "Code updated\n"
+                        await lambda_deploy_queue.wait_for_update(lambda_client, function_name)
+                    await executor.run_aws(
+                        lambda_client.update_function_configuration,
+                        FunctionName=function_name,
+                        Runtime=config.runtime or 'python3.9',
+                        Environment={
+                            'Variables': config.environment_variables or {}
+                        }
+                    )
+                await lambda_deploy_queue.wait_for_update(lambda_client, function_name)
+                
+                version = await lambda_deploy_queue.publish(
+                    lambda_client, function_name, package_sha256,
+                    alias=config.environment, description=f'{config.repository_name}@{config.branch}'
                 )
+                deployment.logs += f"Published version {version['Version']} as alias {alias_name(config.environment)}\n"
+                return version
+            
+            with package:
+                version, superseded = await lambda_deploy_queue.submit(None, function_name, apply)
+            if superseded:
+                deployment.logs += f"Superseded by a newer queued deploy, function is at version {version['Version']}\n"
             
             deployment.status = "success"
             deployment.completed_at = datetime.now()
@@ -172,12 +323,9 @@ class DeploymentService:
         """Deploy static site to S3"""
         try:
             deployment.status = "building"
-            deployment.logs = "Downloading repository...\n"
-            
-            # Download repository
-            repo_archive = self.github_service.download_repository_archive(
-                access_token, config.repository_name, config.branch
-            )
+            deployment.logs = "Validating repository...\n"
+            await self._validate_repository(access_token, config, deployment.commit_sha)
+            repo_archive = await self._get_archive(access_token, config, deployment)
             
             deployment.logs += "Creating S3 bucket for static hosting...\n"
             
@@ -186,12 +334,13 @@ class DeploymentService:
             bucket_name = f"{config.repository_name.replace('/', '-')}-{config.environment}".lower()
             
             try:
-                s3_client.create_bucket(Bucket=bucket_name)
+                await executor.run_aws(s3_client.create_bucket, Bucket=bucket_name)
             except s3_client.exceptions.BucketAlreadyExists:
                 pass
             
             # Configure static website hosting
-            s3_client.put_bucket_website(
+            await executor.run_aws(
+                s3_client.put_bucket_website,
                 Bucket=bucket_name,
                 WebsiteConfiguration={
                     'IndexDocument': {'Suffix': 'index.html'},
@@ -200,7 +349,8 @@ class DeploymentService:
             )
             
             # Make bucket public
-            s3_client.put_bucket_policy(
+            await executor.run_aws(
+                s3_client.put_bucket_policy,
                 Bucket=bucket_name,
                 Policy=json.dumps({
                     "Version": "2012-10-17",
@@ -213,22 +363,30 @@ class DeploymentService:
                 })
             )
             
+            deployment.status = "deploying"
             deployment.logs += "Uploading files to S3...\n"
             
-            # Extract and upload files
-            with zipfile.ZipFile(io.BytesIO(repo_archive), 'r') as zip_ref:
-                for file_info in zip_ref.filelist:
-                    if not file_info.is_dir() and not file_info.filename.startswith('.'):
-                        # Get clean filename (remove repo prefix)
-                        clean_name = '/'.join(file_info.filename.split('/')[1:])
-                        if clean_name:
-                            file_content = zip_ref.read(file_info.filename)
-                            s3_client.put_object(
-                                Bucket=bucket_name,
-                                Key=clean_name,
-                                Body=file_content,
-                                ContentType=self._get_content_type(clean_name)
-                            )
+            # Extract and upload files in parallel, only the changed ones when syncing
+            with repo_archive:
+                report = await static_site_uploader.upload_archive(repo_archive.name, bucket_name, sync=config.sync)
+            if config.sync:
+                deployment.logs += (
+                    f"Synced {report['files']} files: {report['added']} added, {report['changed']} changed, "
+                    f"{report['deleted']} deleted, {report['skipped']} skipped\n"
+                )
+                if report['delete_errors']:
+                    deployment.logs += f"Failed to delete {report['delete_errors']} stale objects\n"
+            if report['compressed_files']:
+                deployment.logs += (
+                    f"Compressed {report['compressed_files']} text assets with {report['compression_encoding']}: "
+                    f"{report['original_bytes'] / 1024:.1f} KB -> {report['compressed_bytes'] / 1024:.1f} KB "
+                    f"(ratio {report['compression_ratio']})\n"
+                )
+            uploaded = report['added'] + report['changed']
+            deployment.logs += (
+                f"Uploaded {uploaded} files ({report['bytes'] / 1024 ** 2:.1f} MB) in {report['seconds']}s: "
+                f"{report['files_per_second']} files/s, {report['mb_per_second']} MB/s\n"
+            )
             
             deployment.status = "success"
             deployment.completed_at = datetime.now()
@@ -246,28 +404,96 @@ class DeploymentService:
         deployment.completed_at = datetime.now()
         deployment.logs = "EC2 deployment not implemented in this demo. Consider using AWS CodeDeploy for production EC2 deployments.\n"
     
+    async def _get_archive(self, access_token: str, config: DeploymentConfig, deployment: Deployment) -> BinaryIO:
+        """Get the deployment commit's archive from the artifact cache, downloading it on a miss"""
+        archive, cached = await self._produce_once(
+            (config.repository_name, deployment.commit_sha, 'archive'),
+            lambda: self._download_archive(access_token, config, deployment)
+        )
+        if cached:
+            deployment.logs += f"Using cached archive for {deployment.commit_sha[:7]}\n"
+        return archive
+    
+    async def _download_archive(self, access_token: str, config: DeploymentConfig, deployment: Deployment) -> BinaryIO:
+        """Download the commit's archive into the artifact cache"""
+        deployment.logs += "Downloading repository...\n"
+        download = await executor.run_github(
+            self.github_service.download_repository_archive,
+            access_token, config.repository_name, deployment.commit_sha
+        )
+        with download:
+            return await executor.run_github(
+                self.artifact_cache.store, download, config.repository_name, deployment.commit_sha, 'archive'
+            )
+    
+    async def _build_lambda_package(self, access_token: str, config: DeploymentConfig,
+                                    deployment: Deployment) -> Tuple[BinaryIO, str]:
+        """Repack the commit's archive into a Lambda package in the artifact cache.
+
+        Returns the package and its base64 SHA-256.
+        """
+        repo_archive = await self._get_archive(access_token, config, deployment)
+        deployment.logs += "Packaging deployment artifact...\n"
+        # Repack in a worker process straight into the cache directory, off the API's GIL
+        build_path = self.artifact_cache.reserve()
+        try:
+            with repo_archive:
+                package_sha256 = await executor.run_cpu(repack_archive, repo_archive.name, build_path)
+        except BaseException:
+            os.remove(build_path)
+            raise
+        package = await executor.run_aws(
+            self.artifact_cache.store_file, build_path, config.repository_name, deployment.commit_sha, 'lambda'
+        )
+        return package, package_sha256
+    
+    async def _produce_once(self, key: Tuple[str, str, str],
+                            produce: Callable[[], Awaitable[BinaryIO]]) -> Tuple[BinaryIO, bool]:
+        """Open a cached artifact, or produce it, with one producer per key while concurrent deploys wait.
+
+        Returns (artifact, whether it came from the cache).
+        """
+        while True:
+            artifact = self.artifact_cache.open(*key)
+            if artifact is not None:
+                return artifact, True
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            # Resolves when the producer finishes either way; on failure the next waiter takes over
+            await asyncio.shield(inflight)
+        
+        inflight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = inflight
+        try:
+            return await produce(), False
+        finally:
+            del self._inflight[key]
+            inflight.set_result(None)
+    
+    async def _validate_repository(self, access_token: str, config: DeploymentConfig, ref: str):
+        """Check the files a deployment target needs against the cached tree index, before downloading"""
+        _, tree = await executor.run_github(
+            self.github_service.get_repository_tree, access_token, config.repository_name, ref
+        )
+        if tree.truncated:
+            # GitHub caps recursive listings; don't reject what we couldn't see
+            return
+        
+        if config.aws_service == "s3-static" and not tree.exists("index.html"):
+            raise Exception("Repository has no index.html at its root")
+        
+        if config.aws_service == "lambda":
+            runtime = config.runtime or 'python3.9'
+            for prefix, handler_files in LAMBDA_HANDLER_FILES.items():
+                if runtime.startswith(prefix) and not any(tree.exists(name) for name in handler_files):
+                    raise Exception(f"Repository has no handler file ({' or '.join(handler_files)}) for index.handler")
+    
     def _get_lambda_execution_role(self) -> str:
         """Get or create Lambda execution role"""
         # In production, create a proper IAM role
         return "arn:aws:iam::123456789012:role/lambda-execution-role"
     
-    def _get_content_type(self, filename: str) -> str:
-        """Get content type based on file extension"""
-        ext = filename.split('.')[-1].lower()
-        content_types = {
-            'html': 'text/html',
-            'css': 'text/css',
-            'js': 'application/javascript',
-            'json': 'application/json',
-            'png': 'image/png',
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'gif': 'image/gif',
-            'svg': 'image/svg+xml',
-            'ico': 'image/x-icon'
-        }
-        return content_types.get(ext, 'application/octet-stream')
-    
     def get_deployment(self, deployment_id: str) -> Optional[Deployment]:
         """Get deployment by ID"""
         return self.deployments.get(deployment_id)
@@ -277,4 +503,4 @@ class DeploymentService:
         return list(self.deployments.values())
 
 github_service = GitHubService()
-deployment_service = DeploymentService()
+deployment_service = DeploymentService(github_service)
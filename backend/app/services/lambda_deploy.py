@@ -0,0 +1,221 @@
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import time
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Optional, Tuple
+from app.aws_client import aws_client
+from app.executor import executor
+from botocore.exceptions import ClientError
+
+# Read size for hashing and copying packages
+PACKAGE_CHUNK_SIZE = 1024 * 1024
+
+def package_size(package: BinaryIO) -> int:
+    """Size of a package file without reading it"""
+    size = package.seek(0, os.SEEK_END)
+    package.seek(0)
+    return size
+
+def package_digest(package: BinaryIO) -> bytes:
+    """Raw SHA-256 of a package file, read in chunks"""
+    digest = hashlib.sha256()
+    package.seek(0)
+    for chunk in iter(lambda: package.read(PACKAGE_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    package.seek(0)
+    return digest.digest()
+
+def code_sha256(package: BinaryIO) -> str:
+    """Base64 SHA-256 digest in the same form as Lambda's CodeSha256"""
+    return base64.b64encode(package_digest(package)).decode('ascii')
+
+class LambdaCodeUploader:
+    """Uploads Lambda code only when it changed, staging large packages through S3"""
+
+    def __init__(self):
+        self.direct_upload_limit = int(os.getenv('LAMBDA_DIRECT_UPLOAD_LIMIT', str(50 * 1024 * 1024)))
+        self.staging_bucket = os.getenv('LAMBDA_STAGING_BUCKET')
+        self.staging_prefix = os.getenv('LAMBDA_STAGING_PREFIX', 'lambda-packages/')
+
+    async def get_code_sha256(self, lambda_client, function_name: str) -> Optional[str]:
+        """Current CodeSha256 of a function, or None if it does not exist"""
+        try:
+            configuration = await executor.run_aws(
+                lambda_client.get_function_configuration, FunctionName=function_name
+            )
+            return configuration['CodeSha256']
+        except lambda_client.exceptions.ResourceNotFoundException:
+            return None
+
+    async def code_location(self, package: BinaryIO, region: str = None,
+                            package_sha256: Optional[str] = None) -> Dict[str, Any]:
+        """Code parameters for create/update calls: inline below the limit, S3 above it"""
+        if package_size(package) <= self.direct_upload_limit:
+            return {'ZipFile': package.read()}
+        bucket, key = await executor.run_aws(
+            self._stage_package, package, region or aws_client.default_region, package_sha256
+        )
+        return {'S3Bucket': bucket, 'S3Key': key}
+
+    async def update_code(self, lambda_client, function_name: str, package: BinaryIO,
+                          current_sha256: Optional[str] = None, region: str = None,
+                          package_sha256: Optional[str] = None) -> Optional[dict]:
+        """Update function code unless the package matches what is deployed; returns None when skipped"""
+        if current_sha256 is None:
+            current_sha256 = await self.get_code_sha256(lambda_client, function_name)
+        if package_sha256 is None:
+            package_sha256 = await executor.run_aws(code_sha256, package)
+        if current_sha256 == package_sha256:
+            return None
+
+        code = await self.code_location(package, region, package_sha256)
+        return await executor.run_aws(lambda_client.update_function_code, FunctionName=function_name, **code)
+
+    def _stage_package(self, package: BinaryIO, region: str, package_sha256: Optional[str] = None) -> tuple:
+        """Upload a package to the staging bucket under its content hash, once"""
+        s3_client = aws_client.get_client('s3', region)
+        bucket = self.staging_bucket or self._default_staging_bucket(region)
+        aws_client.ensure_bucket(bucket, region)
+
+        digest = base64.b64decode(package_sha256) if package_sha256 else package_digest(package)
+        key = f"{self.staging_prefix}{digest.hex()}.zip"
+        try:
+            s3_client.head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('404', 'NoSuchKey', 'NotFound'):
+                raise
+            s3_client.upload_fileobj(package, bucket, key)
+        return bucket, key
+
+    def _default_staging_bucket(self, region: str) -> str:
+        """Per-account, per-region staging bucket name (Lambda requires a same-region bucket)"""
+        account_id = aws_client.get_client('sts', region).get_caller_identity()['Account']
+        return f"lambda-staging-{account_id}-{region}"
+
+class LambdaDeployQueue:
+    """Serializes deploys per function, coalescing queued ones and waiting out in-progress updates"""
+
+    def __init__(self):
+        self.wait_timeout = float(os.getenv('LAMBDA_UPDATE_WAIT_TIMEOUT', '300'))
+        self.poll_initial = float(os.getenv('LAMBDA_UPDATE_POLL_INITIAL', '0.25'))
+        self.poll_max = float(os.getenv('LAMBDA_UPDATE_POLL_MAX', '5'))
+        self._queues: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._tasks = set()
+
+    async def submit(self, region: str, function_name: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run work after earlier deploys of the function finish; returns (result, superseded)"""
+        key = (region or aws_client.default_region, function_name)
+        future = asyncio.get_running_loop().create_future()
+
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = {'waiters': [], 'running': None}
+            # Keep a reference so the task is not garbage collected while running
+            task = asyncio.create_task(self._drain(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        # Only the newest queued deploy runs; the ones it replaced share its result
+        queue['waiters'].append((future, work))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # A cancelled deploy's work must not run for the deploys it replaced: stop it if it
+            # already started, and the drain falls back to the newest deploy still waiting
+            running = queue['running']
+            if running is not None and running[1] is future:
+                running[0].cancel()
+            raise
+
+    async def _drain(self, key: Tuple[str, str]):
+        """Run queued work for one function until no deploy is left waiting"""
+        queue = self._queues[key]
+        while True:
+            waiters = [(future, work) for future, work in queue['waiters'] if not future.done()]
+            if not waiters:
+                break
+            owner, work = waiters[-1]
+            queue['waiters'] = []
+            task = asyncio.create_task(work())
+            queue['running'] = (task, owner)
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                if not owner.cancelled():
+                    raise
+                # The owning deploy was cancelled mid-run; the others go back in line
+                queue['waiters'] = waiters + queue['waiters']
+                continue
+            except Exception as e:
+                for future, _ in waiters:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                queue['running'] = None
+            for future, waiter_work in waiters:
+                if not future.done():
+                    future.set_result((result, waiter_work is not work))
+        del self._queues[key]
+
+    async def wait_until_ready(self, lambda_client, function_name: str) -> Optional[dict]:
+        """Poll until the function is not Pending or InProgress, backing off; None if it does not exist"""
+        deadline = time.monotonic() + self.wait_timeout
+        delay = self.poll_initial
+        while True:
+            try:
+                configuration = await executor.run_aws(
+                    lambda_client.get_function_configuration, FunctionName=function_name
+                )
+            except lambda_client.exceptions.ResourceNotFoundException:
+                return None
+            if configuration.get('State') != 'Pending' and configuration.get('LastUpdateStatus') != 'InProgress':
+                return configuration
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"{function_name} still updating after {self.wait_timeout:g}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.poll_max)
+
+    async def wait_for_update(self, lambda_client, function_name: str) -> dict:
+        """Wait for the update just issued and fail if Lambda rejected it"""
+        configuration = await self.wait_until_ready(lambda_client, function_name)
+        if configuration is None:
+            raise Exception(f"Lambda function {function_name} no longer exists")
+        if configuration.get('State') == 'Failed' or configuration.get('LastUpdateStatus') == 'Failed':
+            reason = configuration.get('LastUpdateStatusReason') or configuration.get('StateReason')
+            raise Exception(f"Lambda update of {function_name} failed: {reason}")
+        return configuration
+
+    async def publish(self, lambda_client, function_name: str, code_sha256: str,
+                      alias: Optional[str] = None, description: str = '') -> dict:
+        """Publish a version of exactly this code and point the alias at it"""
+        version = await executor.run_aws(
+            lambda_client.publish_version,
+            FunctionName=function_name,
+            CodeSha256=code_sha256,
+            Description=description
+        )
+        if alias:
+            alias = alias_name(alias)
+            try:
+                await executor.run_aws(
+                    lambda_client.update_alias,
+                    FunctionName=function_name, Name=alias, FunctionVersion=version['Version']
+                )
+            except lambda_client.exceptions.ResourceNotFoundException:
+                await executor.run_aws(
+                    lambda_client.create_alias,
+                    FunctionName=function_name, Name=alias, FunctionVersion=version['Version']
+                )
+        return version
+
+def alias_name(name: str) -> str:
+    """Turn an environment name into a valid Lambda alias"""
+    alias = re.sub(r'[^A-Za-z0-9_-]', '-', name)[:128]
+    # Purely numeric names would collide with version numbers
+    return f"env-{alias}"[:128] if alias.isdigit() else alias
+
+lambda_code_uploader = LambdaCodeUploader()
+lambda_deploy_queue = LambdaDeployQueue()
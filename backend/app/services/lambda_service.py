@@ -1,80 +1,251 @@
-from typing import List
+import asyncio
+import functools
+import io
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
 from app.aws_client import aws_client
-from app.models.aws_models import LambdaFunction, CreateLambdaRequest
+from app.executor import executor
+from app.fanout import region_fanout
+from app.services.lambda_deploy import lambda_code_uploader
+from app.models.aws_models import (
+    LambdaFunction, LambdaInventory, CreateLambdaRequest, BatchInvokeRequest, InvocationResult
+)
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import base64
 
+# Optional per-function details that can be requested with fields=
+LAMBDA_DETAIL_FIELDS = {'concurrency', 'aliases', 'event_source_mappings', 'layers'}
+
 class LambdaService:
     def __init__(self):
-        self.lambda_client = aws_client.get_client('lambda')
+        self.detail_concurrency = int(os.getenv('LAMBDA_DETAIL_CONCURRENCY', '16'))
+        self.invoke_concurrency = int(os.getenv('LAMBDA_INVOKE_CONCURRENCY', '32'))
+        self.max_invoke_concurrency = int(os.getenv('LAMBDA_INVOKE_MAX_CONCURRENCY', '256'))
+        self.invoke_timeout = float(os.getenv('LAMBDA_INVOKE_TIMEOUT', '900'))
+        # Invocations wait as long as the function may run and are never retried: a retried
+        # RequestResponse call that timed out on the client side would execute the function twice
+        self.invoke_client_config = Config(
+            read_timeout=self.invoke_timeout,
+            retries={'max_attempts': 0},
+            max_pool_connections=self.max_invoke_concurrency
+        )
 
-    async def list_functions(self) -> List[LambdaFunction]:
-        """List all Lambda functions"""
-        try:
-            response = self.lambda_client.list_functions()
+    async def list_functions(self, region: str = None, fields: Optional[List[str]] = None) -> List[LambdaFunction]:
+        """List Lambda functions in specified region or all regions"""
+        inventory = await self.list_inventory(region, fields)
+        return inventory.functions
+
+    async def list_inventory(self, region: str = None, fields: Optional[List[str]] = None) -> LambdaInventory:
+        """List Lambda functions across regions concurrently, loading extra detail fields on request"""
+        fields = set(fields or [])
+        unknown = fields - LAMBDA_DETAIL_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        regions_to_check = [region] if region else aws_client.get_all_regions()
+        iter_pages = functools.partial(self._iter_region_function_pages, include_layers='layers' in fields)
+        results, statuses = await region_fanout.collect(iter_pages, regions_to_check, raise_if_all_fail=True)
+
+        functions = []
+        for current_region in regions_to_check:
+            for page in results.get(current_region, []):
+                functions.extend(page)
+
+        # Layers come with the listing; everything else costs extra calls per function
+        detail_fields = fields - {'layers'}
+        if detail_fields:
+            semaphore = asyncio.Semaphore(self.detail_concurrency)
+
+            async def load(function: LambdaFunction):
+                # A throttled or denied detail call leaves its fields empty instead of failing the listing
+                async with semaphore:
+                    try:
+                        details, errors = await executor.run_aws(self._get_function_details, function, detail_fields)
+                    except Exception as e:
+                        details, errors = {}, {field: str(e) for field in detail_fields}
+                for name, value in details.items():
+                    setattr(function, name, value)
+                if errors:
+                    function.detail_errors = errors
+
+            await asyncio.gather(*(load(function) for function in functions))
+
+        return LambdaInventory(functions=functions, regions=statuses)
+
+    def _iter_region_function_pages(self, region: str, include_layers: bool = False) -> Iterator[List[LambdaFunction]]:
+        """Iterate list_functions pages in a single region"""
+        lambda_client = aws_client.get_client('lambda', region)
+
+        for page in lambda_client.get_paginator('list_functions').paginate():
             functions = []
-            
-            for function in response['Functions']:
+            for function in page['Functions']:
                 lambda_function = LambdaFunction(
                     function_name=function['FunctionName'],
-                    runtime=function['Runtime'],
-                    handler=function['Handler'],
+                    runtime=function.get('Runtime'),
+                    handler=function.get('Handler'),
                     role=function['Role'],
-                    code_size=function['CodeSize'],
-                    last_modified=function['LastModified']
+                    code_size=function.get('CodeSize'),
+                    last_modified=function.get('LastModified'),
+                    package_type=function.get('PackageType'),
+                    region=region
                 )
+                if include_layers:
+                    lambda_function.layers = [layer['Arn'] for layer in function.get('Layers', [])]
                 functions.append(lambda_function)
-            
-            return functions
-        except ClientError as e:
-            raise Exception(f"Error listing Lambda functions: {str(e)}")
+            yield functions
+
+    def _get_function_details(self, function: LambdaFunction, fields: Set[str]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Fetch the requested per-function detail fields, returning (details, errors by field)"""
+        lambda_client = aws_client.get_client('lambda', function.region)
+        details, errors = {}, {}
+
+        if 'concurrency' in fields:
+            try:
+                response = lambda_client.get_function_concurrency(FunctionName=function.function_name)
+                details['reserved_concurrency'] = response.get('ReservedConcurrentExecutions')
+            except Exception as e:
+                errors['concurrency'] = str(e)
+
+        if 'aliases' in fields:
+            try:
+                details['aliases'] = [
+                    alias['Name']
+                    for page in lambda_client.get_paginator('list_aliases').paginate(FunctionName=function.function_name)
+                    for alias in page['Aliases']
+                ]
+            except Exception as e:
+                errors['aliases'] = str(e)
+
+        if 'event_source_mappings' in fields:
+            try:
+                paginator = lambda_client.get_paginator('list_event_source_mappings')
+                details['event_source_mappings'] = [
+                    {
+                        'uuid': mapping['UUID'],
+                        'event_source_arn': mapping.get('EventSourceArn'),
+                        'state': mapping.get('State'),
+                        'batch_size': mapping.get('BatchSize')
+                    }
+                    for page in paginator.paginate(FunctionName=function.function_name)
+                    for mapping in page['EventSourceMappings']
+                ]
+            except Exception as e:
+                errors['event_source_mappings'] = str(e)
+
+        return details, errors
 
     async def create_function(self, request: CreateLambdaRequest) -> dict:
-        """Create a new Lambda function"""
+        """Create a new Lambda function in the requested region"""
         try:
+            lambda_client = aws_client.get_client('lambda', request.region)
+
             # Encode the code as base64
             code_bytes = request.code.encode('utf-8')
             
-            response = self.lambda_client.create_function(
+            # Packages over the direct-upload limit are staged through S3
+            code = await lambda_code_uploader.code_location(io.BytesIO(code_bytes), request.region)
+            
+            response = await executor.run_aws(
+                lambda_client.create_function,
                 FunctionName=request.function_name,
                 Runtime=request.runtime,
                 Role=request.role,
                 Handler=request.handler,
-                Code={
-                    'ZipFile': code_bytes
-                },
+                Code=code,
                 Description='Created via AWS Resource Monitor'
             )
             return response
         except ClientError as e:
             raise Exception(f"Error creating Lambda function: {str(e)}")
 
-    async def delete_function(self, function_name: str) -> dict:
+    async def delete_function(self, function_name: str, region: str = None) -> dict:
         """Delete a Lambda function"""
         try:
-            response = self.lambda_client.delete_function(FunctionName=function_name)
+            lambda_client = aws_client.get_client('lambda', region)
+            response = await executor.run_aws(lambda_client.delete_function, FunctionName=function_name)
             return response
         except ClientError as e:
             raise Exception(f"Error deleting Lambda function: {str(e)}")
 
-    async def invoke_function(self, function_name: str, payload: dict = None) -> dict:
+    async def invoke_function(self, function_name: str, payload: dict = None, region: str = None) -> dict:
         """Invoke a Lambda function"""
         try:
-            import json
-            
-            params = {'FunctionName': function_name}
-            if payload:
-                params['Payload'] = json.dumps(payload)
-            
-            response = self.lambda_client.invoke(**params)
+            lambda_client = aws_client.get_client('lambda', region, self.invoke_client_config)
+            response = await executor.run_invoke(
+                self._invoke, lambda_client, function_name, payload, 'RequestResponse',
+                timeout=self.invoke_timeout
+            )
             return response
         except ClientError as e:
             raise Exception(f"Error invoking Lambda function: {str(e)}")
 
-    async def get_function(self, function_name: str) -> dict:
+    async def stream_invocations(
+        self,
+        function_name: str,
+        request: BatchInvokeRequest,
+        region: str = None
+    ) -> AsyncIterator[InvocationResult]:
+        """Invoke a function once per payload and yield results in completion order"""
+        lambda_client = aws_client.get_client('lambda', region, self.invoke_client_config)
+        concurrency = max(1, min(request.concurrency or self.invoke_concurrency, self.max_invoke_concurrency))
+        results: asyncio.Queue = asyncio.Queue()
+        pending = iter(enumerate(request.payloads))
+
+        async def worker():
+            # Workers share one iterator, so at most `concurrency` invocations are in flight
+            for index, payload in pending:
+                started = time.perf_counter()
+                try:
+                    response = await executor.run_invoke(
+                        self._invoke, lambda_client, function_name, payload, request.invocation_type,
+                        timeout=self.invoke_timeout
+                    )
+                    result = InvocationResult(
+                        index=index,
+                        status_code=response['StatusCode'],
+                        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                        function_error=response.get('FunctionError'),
+                        executed_version=response.get('ExecutedVersion'),
+                        payload=response.get('Payload')
+                    )
+                except Exception as e:
+                    result = InvocationResult(
+                        index=index,
+                        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                        error=str(e)
+                    )
+                await results.put(result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(request.payloads)))]
+        try:
+            for _ in range(len(request.payloads)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+
+    def _invoke(self, lambda_client, function_name: str, payload: Any, invocation_type: str) -> dict:
+        """Invoke a function and read the response payload into JSON-friendly data"""
+        params = {'FunctionName': function_name, 'InvocationType': invocation_type}
+        if payload is not None:
+            params['Payload'] = json.dumps(payload)
+
+        response = lambda_client.invoke(**params)
+        body = response['Payload'].read() if 'Payload' in response else b''
+        try:
+            response['Payload'] = json.loads(body) if body else None
+        except ValueError:
+            response['Payload'] = body.decode('utf-8', errors='replace')
+        return response
+
+    async def get_function(self, function_name: str, region: str = None) -> dict:
         """Get Lambda function details"""
         try:
-            response = self.lambda_client.get_function(FunctionName=function_name)
+            lambda_client = aws_client.get_client('lambda', region)
+            response = await executor.run_aws(lambda_client.get_function, FunctionName=function_name)
             return response
         except ClientError as e:
             raise Exception(f"Error getting Lambda function: {str(e)}")
@@ -1,38 +1,100 @@
-from typing import List
+import asyncio
+from typing import Callable, Iterator, List, Tuple
 from app.aws_client import aws_client
-from app.models.aws_models import RDSInstance, CreateRDSRequest
+from app.executor import executor
+from app.fanout import region_fanout
+from app.models.aws_models import (
+    RDSInstance, RDSCluster, RDSInventory, CreateRDSRequest, DBInstanceRef, BatchOperationResult
+)
 from botocore.exceptions import ClientError
 
 class RDSService:
     def __init__(self):
-        self.rds_client = aws_client.get_client('rds')
+        pass
 
-    async def list_instances(self) -> List[RDSInstance]:
-        """List all RDS instances"""
-        try:
-            response = self.rds_client.describe_db_instances()
-            instances = []
-            
-            for db_instance in response['DBInstances']:
-                rds_instance = RDSInstance(
+    async def list_instances(self, region: str = None) -> List[RDSInstance]:
+        """List RDS instances in specified region or all regions"""
+        return await self._collect(self._iter_instance_pages, region)
+
+    async def list_clusters(self, region: str = None) -> List[RDSCluster]:
+        """List Aurora and Multi-AZ DB clusters in specified region or all regions"""
+        return await self._collect(self._iter_cluster_pages, region)
+
+    async def list_inventory(self, region: str = None) -> RDSInventory:
+        """List RDS instances and clusters across regions concurrently, with per-region status"""
+        regions_to_check = [region] if region else aws_client.get_all_regions()
+        results, statuses = await region_fanout.collect(self._iter_region_pages, regions_to_check, raise_if_all_fail=True)
+
+        collected = {'instances': [], 'clusters': []}
+        for current_region in regions_to_check:
+            for kind, page in results.get(current_region, []):
+                collected[kind].extend(page)
+        instances, clusters = collected['instances'], collected['clusters']
+
+        return RDSInventory(instances=instances, clusters=clusters, regions=statuses)
+
+    async def _collect(self, iter_pages: Callable[[str], Iterator[list]], region: str = None) -> list:
+        """Fan one resource type's pages out over the regions and flatten them in region order"""
+        regions_to_check = [region] if region else aws_client.get_all_regions()
+        results, _ = await region_fanout.collect(iter_pages, regions_to_check, raise_if_all_fail=True)
+        return [
+            item
+            for current_region in regions_to_check
+            for page in results.get(current_region, [])
+            for item in page
+        ]
+
+    def _iter_region_pages(self, region: str) -> Iterator[Tuple[str, list]]:
+        """Iterate ('instances', [...]) then ('clusters', [...]) pages for a single region"""
+        for page in self._iter_instance_pages(region):
+            yield 'instances', page
+        for page in self._iter_cluster_pages(region):
+            yield 'clusters', page
+
+    def _iter_instance_pages(self, region: str) -> Iterator[List[RDSInstance]]:
+        """Iterate describe_db_instances pages for a single region"""
+        rds_client = aws_client.get_client('rds', region)
+        for page in rds_client.get_paginator('describe_db_instances').paginate():
+            yield [
+                RDSInstance(
                     db_instance_identifier=db_instance['DBInstanceIdentifier'],
                     db_instance_class=db_instance['DBInstanceClass'],
                     engine=db_instance['Engine'],
                     status=db_instance['DBInstanceStatus'],
                     endpoint=db_instance.get('Endpoint', {}).get('Address'),
                     port=db_instance.get('Endpoint', {}).get('Port'),
-                    allocated_storage=db_instance.get('AllocatedStorage')
+                    allocated_storage=db_instance.get('AllocatedStorage'),
+                    db_cluster_identifier=db_instance.get('DBClusterIdentifier'),
+                    region=region
                 )
-                instances.append(rds_instance)
-            
-            return instances
-        except ClientError as e:
-            raise Exception(f"Error listing RDS instances: {str(e)}")
+                for db_instance in page['DBInstances']
+            ]
+
+    def _iter_cluster_pages(self, region: str) -> Iterator[List[RDSCluster]]:
+        """Iterate describe_db_clusters pages for a single region"""
+        rds_client = aws_client.get_client('rds', region)
+        for page in rds_client.get_paginator('describe_db_clusters').paginate():
+            yield [
+                RDSCluster(
+                    db_cluster_identifier=db_cluster['DBClusterIdentifier'],
+                    engine=db_cluster['Engine'],
+                    engine_version=db_cluster.get('EngineVersion'),
+                    status=db_cluster['Status'],
+                    endpoint=db_cluster.get('Endpoint'),
+                    reader_endpoint=db_cluster.get('ReaderEndpoint'),
+                    port=db_cluster.get('Port'),
+                    members=[member['DBInstanceIdentifier'] for member in db_cluster.get('DBClusterMembers', [])],
+                    region=region
+                )
+                for db_cluster in page['DBClusters']
+            ]
 
     async def create_instance(self, request: CreateRDSRequest) -> dict:
-        """Create a new RDS instance"""
+        """Create a new RDS instance in the requested region"""
         try:
-            response = self.rds_client.create_db_instance(
+            rds_client = aws_client.get_client('rds', request.region)
+            response = await executor.run_aws(
+                rds_client.create_db_instance,
                 DBInstanceIdentifier=request.db_instance_identifier,
                 DBInstanceClass=request.db_instance_class,
                 Engine=request.engine,
@@ -48,10 +110,12 @@ class RDSService:
         except ClientError as e:
             raise Exception(f"Error creating RDS instance: {str(e)}")
 
-    async def delete_instance(self, db_instance_identifier: str) -> dict:
+    async def delete_instance(self, db_instance_identifier: str, region: str = None) -> dict:
         """Delete an RDS instance"""
         try:
-            response = self.rds_client.delete_db_instance(
+            rds_client = aws_client.get_client('rds', region)
+            response = await executor.run_aws(
+                rds_client.delete_db_instance,
                 DBInstanceIdentifier=db_instance_identifier,
                 SkipFinalSnapshot=True
             )
@@ -59,24 +123,59 @@ class RDSService:
         except ClientError as e:
             raise Exception(f"Error deleting RDS instance: {str(e)}")
 
-    async def start_instance(self, db_instance_identifier: str) -> dict:
+    async def start_instance(self, db_instance_identifier: str, region: str = None) -> dict:
         """Start an RDS instance"""
         try:
-            response = self.rds_client.start_db_instance(
+            rds_client = aws_client.get_client('rds', region)
+            response = await executor.run_aws(
+                rds_client.start_db_instance,
                 DBInstanceIdentifier=db_instance_identifier
             )
             return response
         except ClientError as e:
             raise Exception(f"Error starting RDS instance: {str(e)}")
 
-    async def stop_instance(self, db_instance_identifier: str) -> dict:
+    async def stop_instance(self, db_instance_identifier: str, region: str = None) -> dict:
         """Stop an RDS instance"""
         try:
-            response = self.rds_client.stop_db_instance(
+            rds_client = aws_client.get_client('rds', region)
+            response = await executor.run_aws(
+                rds_client.stop_db_instance,
                 DBInstanceIdentifier=db_instance_identifier
             )
             return response
         except ClientError as e:
             raise Exception(f"Error stopping RDS instance: {str(e)}")
 
+    async def batch_instance_action(self, action: str, instances: List[DBInstanceRef]) -> List[BatchOperationResult]:
+        """Start or stop many RDS instances concurrently across regions"""
+        operations = {'start': 'start_db_instance', 'stop': 'stop_db_instance'}
+        if action not in operations:
+            raise ValueError(f"Unsupported batch action: {action}")
+
+        # RDS has no multi-instance start/stop, so run the single calls side by side
+        semaphore = asyncio.Semaphore(region_fanout.concurrency)
+
+        async def apply(ref: DBInstanceRef) -> BatchOperationResult:
+            region = ref.region or aws_client.default_region
+            async with semaphore:
+                try:
+                    rds_client = aws_client.get_client('rds', region)
+                    response = await executor.run_aws(
+                        getattr(rds_client, operations[action]),
+                        DBInstanceIdentifier=ref.db_instance_identifier
+                    )
+                except Exception as e:
+                    return BatchOperationResult(
+                        instance_id=ref.db_instance_identifier, region=region, success=False, error=str(e)
+                    )
+            return BatchOperationResult(
+                instance_id=ref.db_instance_identifier,
+                region=region,
+                success=True,
+                current_state=response['DBInstance'].get('DBInstanceStatus')
+            )
+
+        return list(await asyncio.gather(*(apply(ref) for ref in instances)))
+
 rds_service = RDSService()
@@ -0,0 +1,58 @@
+import fnmatch
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.models.github_models import RepositoryTreeEntry
+
+class RepositoryTree:
+    """In-memory path index over one recursive Git tree listing"""
+
+    def __init__(self, tree_sha: str, entries: List[RepositoryTreeEntry], truncated: bool = False):
+        self.tree_sha = tree_sha
+        self.entries = entries
+        self.truncated = truncated
+        self._by_path: Dict[str, RepositoryTreeEntry] = {entry.path: entry for entry in entries}
+
+    def get(self, path: str) -> Optional[RepositoryTreeEntry]:
+        """Look up a single file or directory"""
+        return self._by_path.get(path.strip('/'))
+
+    def exists(self, path: str) -> bool:
+        """Whether a file or directory exists at path"""
+        return path.strip('/') in self._by_path
+
+    def list_dir(self, path: str = "") -> List[RepositoryTreeEntry]:
+        """Direct children of a directory ("" for the root)"""
+        prefix = f"{path.strip('/')}/" if path.strip('/') else ""
+        return [
+            entry for entry in self.entries
+            if entry.path.startswith(prefix) and '/' not in entry.path[len(prefix):]
+        ]
+
+    def glob(self, pattern: str) -> List[RepositoryTreeEntry]:
+        """Entries whose full path matches an fnmatch pattern (* also crosses directories)"""
+        return [entry for entry in self.entries if fnmatch.fnmatchcase(entry.path, pattern)]
+
+class RepositoryTreeCache:
+    """LRU cache of repository trees keyed by tree SHA, which never changes content"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._trees: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, tree_sha: str) -> Optional[RepositoryTree]:
+        """Get a cached tree and mark it recently used"""
+        with self._lock:
+            tree = self._trees.get(tree_sha)
+            if tree is not None:
+                self._trees.move_to_end(tree_sha)
+            return tree
+
+    def set(self, tree: RepositoryTree):
+        """Store a tree, evicting the least recently used ones over the limit"""
+        with self._lock:
+            self._trees[tree.tree_sha] = tree
+            self._trees.move_to_end(tree.tree_sha)
+            while len(self._trees) > self.max_entries:
+                self._trees.popitem(last=False)
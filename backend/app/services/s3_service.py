@@ -1,34 +1,70 @@
-from typing import List
+import asyncio
+import os
+import time
+from typing import AsyncIterator, List, Optional
 from app.aws_client import aws_client
-from app.models.aws_models import S3Bucket, CreateS3Request
+from app.cache import PersistentTTLCache
+from app.executor import executor
+from app.jobs import job_manager
+from app.models.aws_models import S3Bucket, S3Object, S3ObjectPage, BucketStats, CreateS3Request, Job
+from app.services.bucket_stats import BucketStatsAggregator
+from app.pagination import encode_cursor, decode_cursor
 from botocore.exceptions import ClientError
 
+# delete_objects accepts up to 1000 keys per request
+S3_DELETE_BATCH_SIZE = 1000
+
+# Error messages kept in a delete job's progress
+S3_DELETE_ERROR_SAMPLES = 5
+
 class S3Service:
     def __init__(self):
-        pass
+        self.region_concurrency = int(os.getenv('S3_REGION_CONCURRENCY', '16'))
+        self.delete_concurrency = int(os.getenv('S3_DELETE_CONCURRENCY', '8'))
+        self.stats_concurrency = int(os.getenv('S3_STATS_CONCURRENCY', '8'))
+        self.bucket_regions = PersistentTTLCache(
+            os.getenv('S3_REGION_CACHE_PATH', '.cache/s3_bucket_regions.json'),
+            float(os.getenv('S3_REGION_CACHE_TTL', '86400'))
+        )
+        self.bucket_stats = PersistentTTLCache(
+            os.getenv('S3_STATS_CACHE_PATH', '.cache/s3_bucket_stats.json'),
+            float(os.getenv('S3_STATS_CACHE_TTL', '86400'))
+        )
 
-    async def list_buckets(self) -> List[S3Bucket]:
-        """List all S3 buckets"""
+    async def list_buckets(self, include_stats: bool = False) -> List[S3Bucket]:
+        """List all S3 buckets, optionally with their last computed statistics"""
         try:
             s3_client = aws_client.get_client('s3')
-            response = s3_client.list_buckets()
+            response = await executor.run_aws(s3_client.list_buckets)
+            bucket_names = [bucket['Name'] for bucket in response['Buckets']]
+
+            # Forget buckets that no longer exist, then resolve only the unknown ones
+            self.bucket_regions.retain(bucket_names)
+            self.bucket_stats.retain(bucket_names)
+            regions = {name: self.bucket_regions.get(name) for name in bucket_names}
+            missing = [name for name, region in regions.items() if region is None]
+
+            semaphore = asyncio.Semaphore(self.region_concurrency)
+
+            async def resolve(bucket_name: str) -> Optional[str]:
+                async with semaphore:
+                    return await self._resolve_bucket_region(bucket_name)
+
+            resolved = await asyncio.gather(*(resolve(name) for name in missing))
+            resolved_regions = {name: region for name, region in zip(missing, resolved) if region}
+            self.bucket_regions.set_many(resolved_regions)
+            regions.update(resolved_regions)
+
             buckets = []
-            
             for bucket in response['Buckets']:
-                # Get bucket location
-                try:
-                    location_response = s3_client.get_bucket_location(Bucket=bucket['Name'])
-                    region = location_response['LocationConstraint'] or 'us-east-1'
-                except:
-                    region = 'us-east-1'
-                
                 s3_bucket = S3Bucket(
                     name=bucket['Name'],
                     creation_date=bucket['CreationDate'],
-                    region=region
+                    region=regions.get(bucket['Name']) or 'us-east-1',
+                    stats=self.get_bucket_stats(bucket['Name']) if include_stats else None
                 )
                 buckets.append(s3_bucket)
-            
+
             return buckets
         except ClientError as e:
             raise Exception(f"Error listing S3 buckets: {str(e)}")
@@ -43,54 +79,230 @@ class S3Service:
             if request.region != 'us-east-1':
                 params['CreateBucketConfiguration'] = {'LocationConstraint': request.region}
             
-            response = s3_client.create_bucket(**params)
+            response = await executor.run_aws(s3_client.create_bucket, **params)
+            self.bucket_regions.set(request.bucket_name, request.region)
             return response
         except ClientError as e:
             raise Exception(f"Error creating S3 bucket: {str(e)}")
 
-    async def delete_bucket(self, bucket_name: str) -> dict:
-        """Delete an S3 bucket"""
+    async def delete_bucket(self, bucket_name: str) -> Job:
+        """Empty and delete an S3 bucket in a background job"""
+        return job_manager.submit(
+            "s3-delete-bucket",
+            lambda job: self._empty_and_delete_bucket(bucket_name, job)
+        )
+
+    async def _empty_and_delete_bucket(self, bucket_name: str, job: Job) -> dict:
+        """Delete every object version and delete marker, then the bucket itself"""
         try:
-            # First get the bucket region
-            s3_client = aws_client.get_client('s3')
-            try:
-                location_response = s3_client.get_bucket_location(Bucket=bucket_name)
-                region = location_response['LocationConstraint'] or 'us-east-1'
-            except:
-                region = 'us-east-1'
-            
+            region = await self.get_bucket_region(bucket_name)
             s3_client = aws_client.get_client('s3', region)
-            
-            # First, delete all objects in the bucket
-            objects_response = s3_client.list_objects_v2(Bucket=bucket_name)
-            if 'Contents' in objects_response:
-                objects = [{'Key': obj['Key']} for obj in objects_response['Contents']]
-                s3_client.delete_objects(
-                    Bucket=bucket_name,
-                    Delete={'Objects': objects}
+            progress = job.progress
+            progress.update(
+                bucket=bucket_name, objects_deleted=0, bytes_deleted=0, errors=0, error_samples=[], objects_per_second=0.0
+            )
+            started = time.perf_counter()
+
+            # Each permit is one delete_objects batch in flight, which also bounds how far listing runs ahead
+            semaphore = asyncio.Semaphore(self.delete_concurrency)
+            pending = set()
+
+            def record_error(message: str):
+                # Keep the first few messages so a failed job says why
+                if len(progress['error_samples']) < S3_DELETE_ERROR_SAMPLES:
+                    progress['error_samples'].append(message)
+
+            async def delete_batch(batch: List[dict]):
+                try:
+                    response = await executor.run_aws(
+                        s3_client.delete_objects,
+                        Bucket=bucket_name,
+                        Delete={
+                            'Objects': [{'Key': entry['Key'], 'VersionId': entry['VersionId']} for entry in batch],
+                            'Quiet': True
+                        }
+                    )
+                    errors = response.get('Errors', [])
+                    for error in errors:
+                        record_error(f"{error['Key']}: {error.get('Code')} {error.get('Message')}")
+                    failed = {(error['Key'], error.get('VersionId')) for error in errors}
+                    for entry in batch:
+                        if (entry['Key'], entry['VersionId']) in failed:
+                            progress['errors'] += 1
+                        else:
+                            progress['objects_deleted'] += 1
+                            progress['bytes_deleted'] += entry.get('Size', 0)
+                except Exception as e:
+                    progress['errors'] += len(batch)
+                    record_error(str(e))
+                finally:
+                    elapsed = time.perf_counter() - started
+                    progress['objects_per_second'] = round(progress['objects_deleted'] / elapsed, 1) if elapsed else 0.0
+                    semaphore.release()
+
+            paginator = s3_client.get_paginator('list_object_versions')
+            while True:
+                listed = 0
+                try:
+                    async for page in executor.iterate_aws(paginator.paginate(Bucket=bucket_name)):
+                        # Versions and delete markers both have to go before the bucket can be deleted
+                        entries = page.get('Versions', []) + page.get('DeleteMarkers', [])
+                        listed += len(entries)
+                        for i in range(0, len(entries), S3_DELETE_BATCH_SIZE):
+                            await semaphore.acquire()
+                            task = asyncio.create_task(delete_batch(entries[i:i + S3_DELETE_BATCH_SIZE]))
+                            pending.add(task)
+                            task.add_done_callback(pending.discard)
+                finally:
+                    # Batches already started finish (and report) even if listing failed partway
+                    await asyncio.gather(*pending)
+
+                # Sweep again to catch objects written while the previous pass was running
+                if not listed or progress['errors']:
+                    break
+
+            if progress['errors']:
+                raise Exception(
+                    f"{progress['errors']} objects could not be deleted: {'; '.join(progress['error_samples'])}"
                 )
-            
-            # Then delete the bucket
-            response = s3_client.delete_bucket(Bucket=bucket_name)
+
+            response = await executor.run_aws(s3_client.delete_bucket, Bucket=bucket_name)
+            self.bucket_regions.invalidate(bucket_name)
+            self.bucket_stats.invalidate(bucket_name)
             return response
         except ClientError as e:
             raise Exception(f"Error deleting S3 bucket: {str(e)}")
 
-    async def list_objects(self, bucket_name: str) -> dict:
-        """List objects in an S3 bucket"""
+    async def compute_bucket_stats(self, bucket_name: str, prefix_depth: int = 1, top_n: int = 10) -> Job:
+        """Compute bucket statistics in a background job"""
+        return job_manager.submit(
+            "s3-bucket-stats",
+            lambda job: self._compute_bucket_stats(bucket_name, prefix_depth, top_n, job)
+        )
+
+    def get_bucket_stats(self, bucket_name: str) -> Optional[BucketStats]:
+        """Get the last computed statistics for a bucket, if still cached"""
+        stats = self.bucket_stats.get(bucket_name)
+        return BucketStats.model_validate(stats) if stats else None
+
+    async def _compute_bucket_stats(self, bucket_name: str, prefix_depth: int, top_n: int, job: Job) -> dict:
+        """Stream the bucket listing into constant-memory aggregates, one walk per top-level folder"""
         try:
-            # First get the bucket region
-            s3_client = aws_client.get_client('s3')
-            try:
-                location_response = s3_client.get_bucket_location(Bucket=bucket_name)
-                region = location_response['LocationConstraint'] or 'us-east-1'
-            except:
-                region = 'us-east-1'
-            
+            region = await self.get_bucket_region(bucket_name)
             s3_client = aws_client.get_client('s3', region)
-            response = s3_client.list_objects_v2(Bucket=bucket_name)
-            return response
+            paginator = s3_client.get_paginator('list_objects_v2')
+            progress = job.progress
+            progress.update(bucket=bucket_name, objects_scanned=0, prefixes_total=0, prefixes_done=0)
+
+            # Count top-level objects directly and collect the folders to walk in parallel
+            totals = BucketStatsAggregator(prefix_depth, top_n)
+            folders = []
+            async for page in executor.iterate_aws(paginator.paginate(Bucket=bucket_name, Delimiter='/')):
+                for obj in page.get('Contents', []):
+                    totals.add(obj)
+                folders.extend(entry['Prefix'] for entry in page.get('CommonPrefixes', []))
+            progress['objects_scanned'] = totals.object_count
+            progress['prefixes_total'] = len(folders)
+
+            semaphore = asyncio.Semaphore(self.stats_concurrency)
+
+            async def walk(prefix: str) -> BucketStatsAggregator:
+                aggregator = BucketStatsAggregator(prefix_depth, top_n)
+                async with semaphore:
+                    async for page in executor.iterate_aws(paginator.paginate(Bucket=bucket_name, Prefix=prefix)):
+                        contents = page.get('Contents', [])
+                        for obj in contents:
+                            aggregator.add(obj)
+                        progress['objects_scanned'] += len(contents)
+                progress['prefixes_done'] += 1
+                return aggregator
+
+            for finished in asyncio.as_completed([walk(prefix) for prefix in folders]):
+                totals.merge(await finished)
+
+            stats = totals.to_stats(bucket_name).model_dump(mode='json')
+            self.bucket_stats.set(bucket_name, stats)
+            return stats
+        except ClientError as e:
+            raise Exception(f"Error computing S3 bucket statistics: {str(e)}")
+
+    async def list_objects(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        delimiter: Optional[str] = None,
+        page_size: int = 1000,
+        cursor: Optional[str] = None
+    ) -> S3ObjectPage:
+        """List one page of objects in an S3 bucket"""
+        try:
+            region = await self.get_bucket_region(bucket_name)
+            s3_client = aws_client.get_client('s3', region)
+
+            params = {'Bucket': bucket_name, 'Prefix': prefix, 'MaxKeys': page_size}
+            if delimiter:
+                params['Delimiter'] = delimiter
+            if cursor:
+                token = decode_cursor(cursor).get('token')
+                if not token:
+                    raise ValueError("Invalid pagination cursor")
+                params['ContinuationToken'] = token
+
+            response = await executor.run_aws(s3_client.list_objects_v2, **params)
+
+            next_cursor = None
+            if response.get('IsTruncated'):
+                next_cursor = encode_cursor({'token': response['NextContinuationToken']})
+
+            return S3ObjectPage(
+                bucket=bucket_name,
+                prefix=prefix,
+                objects=[self._to_object(obj) for obj in response.get('Contents', [])],
+                common_prefixes=[entry['Prefix'] for entry in response.get('CommonPrefixes', [])],
+                next_cursor=next_cursor
+            )
         except ClientError as e:
             raise Exception(f"Error listing S3 objects: {str(e)}")
 
+    async def stream_objects(self, bucket_name: str, prefix: str = "") -> AsyncIterator[S3Object]:
+        """Yield every object under a prefix, one listing page at a time"""
+        region = await self.get_bucket_region(bucket_name)
+        s3_client = aws_client.get_client('s3', region)
+        paginator = s3_client.get_paginator('list_objects_v2')
+
+        async for page in executor.iterate_aws(paginator.paginate(Bucket=bucket_name, Prefix=prefix)):
+            for obj in page.get('Contents', []):
+                yield self._to_object(obj)
+
+    def _to_object(self, obj: dict) -> S3Object:
+        """Convert a list_objects_v2 entry into an S3Object"""
+        return S3Object(
+            key=obj['Key'],
+            size=obj['Size'],
+            last_modified=obj.get('LastModified'),
+            etag=obj.get('ETag', '').strip('"') or None,
+            storage_class=obj.get('StorageClass')
+        )
+
+    async def get_bucket_region(self, bucket_name: str) -> str:
+        """Get a bucket's region, from the cache when possible"""
+        region = self.bucket_regions.get(bucket_name)
+        if region is None:
+            region = await self._resolve_bucket_region(bucket_name)
+            if region is None:
+                return 'us-east-1'
+            self.bucket_regions.set(bucket_name, region)
+        return region
+
+    async def _resolve_bucket_region(self, bucket_name: str) -> Optional[str]:
+        """Look up a bucket's region, or None if it cannot be determined"""
+        s3_client = aws_client.get_client('s3')
+        try:
+            location_response = await executor.run_aws(s3_client.get_bucket_location, Bucket=bucket_name)
+        except Exception:
+            return None
+        location = location_response['LocationConstraint'] or 'us-east-1'
+        # Buckets created long ago in Ireland report the legacy "EU" constraint
+        return 'eu-west-1' if location == 'EU' else location
+
 s3_service = S3Service()
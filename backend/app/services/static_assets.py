@@ -0,0 +1,95 @@
+import gzip
+import mimetypes
+import os
+import re
+from typing import List, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for S3_COMPRESSION_ENCODING=br
+    brotli = None
+
+# Built-in table only, so content types don't depend on the host's /etc/mime.types
+_mime_types = mimetypes.MimeTypes(filenames=())
+for _type, _ext in [
+    ('application/javascript', '.js'),
+    ('application/javascript', '.mjs'),
+    ('application/json', '.map'),
+    ('application/manifest+json', '.webmanifest'),
+    ('application/wasm', '.wasm'),
+    ('font/woff', '.woff'),
+    ('font/woff2', '.woff2'),
+    ('font/ttf', '.ttf'),
+    ('font/otf', '.otf'),
+    ('image/avif', '.avif'),
+    ('image/webp', '.webp'),
+    ('image/x-icon', '.ico'),
+    ('text/markdown', '.md'),
+    ('text/plain', '.txt'),
+]:
+    _mime_types.add_type(_type, _ext)
+
+# Types worth compressing; everything else (images, video, woff2) is already compressed
+COMPRESSIBLE_TYPES = {
+    'application/javascript', 'application/json', 'application/manifest+json', 'application/wasm',
+    'application/xml', 'application/vnd.ms-fontobject', 'font/ttf', 'font/otf', 'image/svg+xml', 'image/x-icon'
+}
+
+# A content hash segment: lowercase hex as webpack emits (app.3f9a1c2e.js) or uppercase base32 as esbuild
+# emits (chunk-5ZQWPLAN.js). It must mix letters and digits, so dated names like report_20240101.pdf don't count.
+FINGERPRINT_PATTERN = re.compile(
+    r'[.\-_](?:(?=[0-9a-f]*[a-f])(?=[0-9a-f]*\d)[0-9a-f]{8,}|(?=[A-Z2-7]*[A-Z])(?=[A-Z2-7]*[2-7])[A-Z2-7]{8})'
+    r'\.[A-Za-z0-9]+$'
+)
+
+# HTML pages: .html/.htm files, and extensionless pretty-URL pages such as about or docs/guide. Extensionless
+# names that are not lowercase (LICENSE, CNAME, _redirects) and anything under .well-known/ are not pages.
+PAGE_PATTERN = re.compile(r'(^|/)[^/]*\.html?$|^(?!\.well-known/)(?:[^/]+/)*[a-z0-9][^/.]*$')
+
+# Extensionless files with a fixed, non-HTML type
+EXTENSIONLESS_TYPES = {
+    'apple-app-site-association': 'application/json',
+}
+
+def content_type(filename: str) -> str:
+    """MIME type of a site file from its extension; extensionless files are HTML only when they are pages"""
+    name = filename.rsplit('/', 1)[-1]
+    if '.' not in name:
+        if name in EXTENSIONLESS_TYPES:
+            return EXTENSIONLESS_TYPES[name]
+        return 'text/html' if PAGE_PATTERN.search(filename) else 'text/plain'
+    mime_type, _ = _mime_types.guess_type(filename, strict=False)
+    return mime_type or 'application/octet-stream'
+
+def is_compressible(mime_type: str) -> bool:
+    """Whether a content type is text-like enough to benefit from compression"""
+    return mime_type.startswith('text/') or mime_type in COMPRESSIBLE_TYPES
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Compress a body deterministically, so unchanged files keep the same ETag between deploys"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+class CacheControlPolicy:
+    """Ordered (pattern, Cache-Control) rules; the first pattern matching the object key wins"""
+
+    def __init__(self, rules: List[Tuple[re.Pattern, str]], default: str):
+        self.rules = rules
+        self.default = default
+
+    @classmethod
+    def from_env(cls) -> 'CacheControlPolicy':
+        return cls(
+            [
+                (FINGERPRINT_PATTERN, os.getenv('S3_CACHE_CONTROL_IMMUTABLE', 'public, max-age=31536000, immutable')),
+                (PAGE_PATTERN, os.getenv('S3_CACHE_CONTROL_HTML', 'public, max-age=60, must-revalidate')),
+            ],
+            os.getenv('S3_CACHE_CONTROL_DEFAULT', 'public, max-age=3600')
+        )
+
+    def for_key(self, key: str) -> str:
+        for pattern, value in self.rules:
+            if pattern.search(key):
+                return value
+        return self.default
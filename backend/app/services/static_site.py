@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from boto3.s3.transfer import TransferConfig
+from app.aws_client import aws_client
+from app.executor import executor
+from app.services import static_assets
+from app.services.archive_tasks import list_site_files, multipart_etag, prepare_assets
+from app.services.static_assets import CacheControlPolicy, content_type, is_compressible
+
+# delete_objects accepts up to 1000 keys per request
+S3_DELETE_BATCH_SIZE = 1000
+
+class StaticSiteUploader:
+    """Uploads a repository archive to an S3 website bucket with parallel and multipart transfers,
+    pre-compressing text assets and tagging every object with its Cache-Control"""
+
+    def __init__(self):
+        self.concurrency = int(os.getenv('S3_UPLOAD_CONCURRENCY', '16'))
+        self.upload_timeout = float(os.getenv('S3_UPLOAD_TIMEOUT', '900'))
+        self.multipart_threshold = int(os.getenv('S3_MULTIPART_THRESHOLD', str(16 * 1024 * 1024)))
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.multipart_threshold,
+            multipart_chunksize=int(os.getenv('S3_MULTIPART_CHUNKSIZE', str(8 * 1024 * 1024))),
+            max_concurrency=int(os.getenv('S3_MULTIPART_CONCURRENCY', '4'))
+        )
+        self.compression_encoding = os.getenv('S3_COMPRESSION_ENCODING', 'gzip')
+        if self.compression_encoding == 'br' and static_assets.brotli is None:
+            self.compression_encoding = 'gzip'
+        self.compression_level = int(os.getenv('S3_COMPRESSION_LEVEL', '9'))
+        self.compression_min_size = int(os.getenv('S3_COMPRESSION_MIN_SIZE', '1024'))
+        self.cache_control = CacheControlPolicy.from_env()
+        self.batch_files = int(os.getenv('S3_UPLOAD_BATCH_FILES', '128'))
+        self.batch_bytes = int(os.getenv('S3_UPLOAD_BATCH_BYTES', str(8 * 1024 * 1024)))
+        # Each site's manifest records every key the pipeline wrote, with a digest of the headers it wrote
+        # them with. It lives in a private bucket, never the public site bucket, since it lists every file.
+        self.manifest_bucket = os.getenv('S3_SITE_MANIFEST_BUCKET')
+        self.manifest_prefix = os.getenv('S3_SITE_MANIFEST_PREFIX', 'site-manifests/')
+
+    async def upload_archive(self, archive_path: str, bucket: str, region: str = None,
+                             sync: bool = False) -> Dict[str, Any]:
+        """Upload every site file in the archive and return throughput figures.
+
+        Extraction, hashing and compression run in batches on the process pool; only the S3 calls
+        run on threads. In sync mode the bucket is listed once up front: files whose ETag and headers
+        already match are skipped, and objects an earlier deploy wrote that are no longer in the archive
+        are deleted. Objects the pipeline did not write are never deleted. Every deploy, sync or not,
+        writes the site's manifest to <manifest bucket>/<manifest prefix><bucket>.json.
+        """
+        s3_client = aws_client.get_client('s3', region)
+        upload_semaphore = asyncio.Semaphore(self.concurrency)
+        # Bounds how many extracted batches sit in memory waiting for upload slots
+        batch_semaphore = asyncio.Semaphore(executor.cpu_max_workers * 2)
+        manifest = await executor.run_aws(self._manifest_location, bucket, region)
+        remote_etags = await self._list_etags(s3_client, bucket) if sync else {}
+        # S3 listings carry no headers, so what was last written with which headers comes from the manifest
+        previous_headers = await self._read_manifest(s3_client, *manifest) if sync else {}
+        written_headers = {}
+        counts = {'added': 0, 'changed': 0, 'skipped': 0, 'deleted': 0, 'delete_errors': 0}
+        compression = {'compressed_files': 0, 'original_bytes': 0, 'compressed_bytes': 0}
+        uploaded_bytes = 0
+        started = time.perf_counter()
+
+        files = await executor.run_cpu(list_site_files, archive_path)
+        small_files = [file for file in files if file[2] < self.multipart_threshold]
+        large_files = [file for file in files if file[2] >= self.multipart_threshold]
+
+        def record(outcome: str, size: int):
+            nonlocal uploaded_bytes
+            counts[outcome] += 1
+            if outcome != 'skipped':
+                uploaded_bytes += size
+
+        async def put(key: str, body: bytes, content_encoding: Optional[str], md5: str, original_size: int):
+            extra_args = self._object_args(key)
+            if content_encoding:
+                extra_args['ContentEncoding'] = content_encoding
+                compression['compressed_files'] += 1
+                compression['original_bytes'] += original_size
+                compression['compressed_bytes'] += len(body)
+            written_headers[key] = headers_digest = self._headers_digest(extra_args)
+            async with upload_semaphore:
+                outcome = await executor.run_aws(
+                    self._put_file, s3_client, bucket, key, body, md5, extra_args, remote_etags.get(key),
+                    previous_headers.get(key) == headers_digest, timeout=self.upload_timeout
+                )
+            record(outcome, len(body))
+
+        async def upload_batch(batch: List[Tuple[str, str, int]]):
+            async with batch_semaphore:
+                members = [(name, key, self._encoding_for(key, size)) for name, key, size in batch]
+                prepared = await executor.run_cpu(prepare_assets, archive_path, members, self.compression_level)
+                await asyncio.gather(*(put(*asset) for asset in prepared))
+
+        async def upload_large(name: str, key: str, size: int):
+            extra_args = self._object_args(key)
+            written_headers[key] = headers_digest = self._headers_digest(extra_args)
+            async with upload_semaphore:
+                remote_etag = remote_etags.get(key)
+                unchanged = remote_etag is not None and previous_headers.get(key) == headers_digest
+                if unchanged and remote_etag == await executor.run_cpu(
+                        multipart_etag, archive_path, name, self.transfer_config.multipart_chunksize):
+                    outcome = 'skipped'
+                else:
+                    await executor.run_aws(
+                        self._upload_large_file, s3_client, archive_path, name, bucket, key, extra_args,
+                        timeout=self.upload_timeout
+                    )
+                    outcome = 'added' if remote_etag is None else 'changed'
+            record(outcome, size)
+
+        await asyncio.gather(
+            *(upload_batch(batch) for batch in self._batches(small_files)),
+            *(upload_large(*file) for file in large_files)
+        )
+
+        await executor.run_aws(self._write_manifest, s3_client, *manifest, written_headers)
+        if sync:
+            stale = sorted((set(previous_headers) & set(remote_etags)) - set(written_headers))
+            counts['deleted'], counts['delete_errors'] = await self._delete_keys(s3_client, bucket, stale)
+
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        uploaded_files = counts['added'] + counts['changed']
+        return {
+            'files': len(files),
+            **counts,
+            **compression,
+            'compression_encoding': self.compression_encoding,
+            'compression_ratio': round(compression['compressed_bytes'] / compression['original_bytes'], 3)
+            if compression['original_bytes'] else None,
+            'bytes': uploaded_bytes,
+            'seconds': round(elapsed, 2),
+            'files_per_second': round(uploaded_files / elapsed, 1),
+            'mb_per_second': round(uploaded_bytes / elapsed / 1024 ** 2, 2)
+        }
+
+    async def _list_etags(self, s3_client, bucket: str) -> Dict[str, str]:
+        """ETag of every object currently in the bucket, from a single listing pass"""
+        etags = {}
+        paginator = s3_client.get_paginator('list_objects_v2')
+        async for page in executor.iterate_aws(paginator.paginate(Bucket=bucket)):
+            for obj in page.get('Contents', []):
+                etags[obj['Key']] = obj['ETag'].strip('"')
+        return etags
+
+    def _manifest_location(self, bucket: str, region: str = None) -> Tuple[str, str]:
+        """(bucket, key) of a site bucket's manifest, creating the default private state bucket on first use"""
+        manifest_bucket = self.manifest_bucket
+        if not manifest_bucket:
+            region = region or aws_client.default_region
+            account_id = aws_client.get_client('sts', region).get_caller_identity()['Account']
+            manifest_bucket = f"deploy-state-{account_id}-{region}"
+        aws_client.ensure_bucket(manifest_bucket, region)
+        return manifest_bucket, f"{self.manifest_prefix}{bucket}.json"
+
+    async def _read_manifest(self, s3_client, bucket: str, key: str) -> Dict[str, str]:
+        """Header digest per key from the last deploy's manifest, empty when there is none"""
+        try:
+            response = await executor.run_aws(s3_client.get_object, Bucket=bucket, Key=key)
+        except s3_client.exceptions.NoSuchKey:
+            return {}
+        body = await executor.run_aws(response['Body'].read)
+        return json.loads(body).get('objects', {})
+
+    def _write_manifest(self, s3_client, bucket: str, key: str, headers: Dict[str, str]):
+        s3_client.put_object(
+            Bucket=bucket, Key=key, ContentType='application/json',
+            Body=json.dumps({'version': 1, 'objects': headers}, sort_keys=True).encode('utf-8')
+        )
+
+    async def _delete_keys(self, s3_client, bucket: str, keys: List[str]) -> Tuple[int, int]:
+        """Delete keys in concurrent delete_objects batches, returning (deleted, failed)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def delete_batch(batch: List[str]) -> int:
+            async with semaphore:
+                response = await executor.run_aws(
+                    s3_client.delete_objects,
+                    Bucket=bucket,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+            return len(response.get('Errors', []))
+
+        batches = [keys[i:i + S3_DELETE_BATCH_SIZE] for i in range(0, len(keys), S3_DELETE_BATCH_SIZE)]
+        failed = sum(await asyncio.gather(*(delete_batch(batch) for batch in batches)))
+        return len(keys) - failed, failed
+
+    def _batches(self, files: List[Tuple[str, str, int]]) -> Iterator[List[Tuple[str, str, int]]]:
+        """Group small files into process-pool batches of bounded count and size"""
+        batch, batch_bytes = [], 0
+        for file in files:
+            batch.append(file)
+            batch_bytes += file[2]
+            if len(batch) >= self.batch_files or batch_bytes >= self.batch_bytes:
+                yield batch
+                batch, batch_bytes = [], 0
+        if batch:
+            yield batch
+
+    def _object_args(self, key: str) -> Dict[str, str]:
+        return {'ContentType': content_type(key), 'CacheControl': self.cache_control.for_key(key)}
+
+    @staticmethod
+    def _headers_digest(extra_args: Dict[str, str]) -> str:
+        """Digest of the headers an object is written with, so a header change alone forces a re-upload"""
+        return hashlib.sha256(json.dumps(extra_args, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _encoding_for(self, key: str, size: int) -> Optional[str]:
+        """Encoding to compress a file with, or None to store it as is"""
+        if size >= self.compression_min_size and is_compressible(content_type(key)):
+            return self.compression_encoding
+        return None
+
+    def _put_file(self, s3_client, bucket: str, key: str, body: bytes, md5: str, extra_args: Dict[str, str],
+                  remote_etag: Optional[str] = None, same_headers: bool = False) -> str:
+        """PUT a small file unless its MD5 matches the remote ETag and its headers are unchanged.
+        Returns 'added', 'changed' or 'skipped'."""
+        if remote_etag is not None and same_headers and remote_etag == md5:
+            return 'skipped'
+        s3_client.put_object(Bucket=bucket, Key=key, Body=body, **extra_args)
+        return 'added' if remote_etag is None else 'changed'
+
+    def _upload_large_file(self, s3_client, archive_path: str, name: str, bucket: str, key: str,
+                           extra_args: Dict[str, str]):
+        """Concurrent multipart upload of a large archive member"""
+        # Stream the member straight into the transfer manager instead of reading it whole
+        with zipfile.ZipFile(archive_path, 'r') as zip_ref, zip_ref.open(name) as body:
+            s3_client.upload_fileobj(body, bucket, key, ExtraArgs=extra_args, Config=self.transfer_config)
+
+static_site_uploader = StaticSiteUploader()
@@ -0,0 +1,41 @@
+"""Shared setup for benchmarks: a standalone moto server the app talks to over HTTP.
+
+Running moto in its own process keeps its request handling off the API process's GIL,
+so latency measured in the API reflects the app rather than the mock.
+"""
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+MOTO_PORT = int(os.getenv('BENCH_MOTO_PORT', '5055'))
+
+@contextlib.contextmanager
+def moto_server():
+    """Run `moto.server` (pip install "moto[server]") and point every boto3 client at it"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'moto.server', '-p', str(MOTO_PORT)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', MOTO_PORT), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("moto server did not start")
+                time.sleep(0.1)
+        os.environ['AWS_ENDPOINT_URL'] = f"http://127.0.0.1:{MOTO_PORT}"
+        yield os.environ['AWS_ENDPOINT_URL']
+    finally:
+        process.terminate()
+        process.wait()
@@ -0,0 +1,113 @@
+"""Peak RSS of downloading and repacking a large repository zipball: buffered in memory (the
+pre-streaming code) versus streamed into a spooled temp file and repacked from disk.
+
+A local HTTP server stands in for GitHub's zipball endpoint. Each mode runs in a fresh
+process and reports how far its peak RSS rose above the RSS after imports.
+
+Run from backend/:  python benchmarks/archive_memory.py [--archive-mb 200]
+"""
+import argparse
+import base64
+import hashlib
+import io
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+ZIPBALL_PATH = '/repos/owner/repo/zipball/main'
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+def build_zipball(path: str, megabytes: int):
+    """Incompressible members, so the archive is as large on the wire as it is unpacked"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as archive:
+        for i in range(megabytes):
+            archive.writestr(f'owner-repo-abc123/data/blob{i}.bin', os.urandom(1024 * 1024))
+
+def serve_file(path: str) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header('Content-Length', str(os.path.getsize(path)))
+            self.end_headers()
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, self.wfile, 1024 * 1024)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def buffered(workdir: str):
+    """The pre-streaming path: response.content, then BytesIO copies for reading and writing"""
+    from app.github_client import github_client
+    archive = github_client.get('token', ZIPBALL_PATH).content
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(archive), 'r') as source, \
+            zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as package:
+        for file_info in sorted(source.infolist(), key=lambda info: info.filename):
+            clean_name = '/'.join(file_info.filename.split('/')[1:])
+            if file_info.is_dir() or not clean_name:
+                continue
+            package.writestr(zipfile.ZipInfo(clean_name, date_time=ZIP_EPOCH), source.read(file_info.filename))
+    package = output.getvalue()
+    base64.b64encode(hashlib.sha256(package).digest())
+
+def streamed(workdir: str):
+    """The current path: spooled download, stored to disk, repacked member by member"""
+    from app.cache import ArtifactCache
+    from app.services.archive_tasks import repack_archive
+    from app.services.github_service import github_service
+    cache = ArtifactCache(workdir, max_bytes=10 * 1024 ** 3)
+    with github_service.download_repository_archive('token', 'owner/repo') as download:
+        archive = cache.store(download, 'owner/repo', 'abc123', 'archive')
+    with archive:
+        repack_archive(archive.name, os.path.join(workdir, 'package.zip'))
+
+MODES = {'buffered': buffered, 'streamed': streamed}
+
+def run_mode(mode: str):
+    # Import everything the mode touches first, so the baseline includes module memory
+    import app.cache, app.github_client, app.services.archive_tasks, app.services.github_service  # noqa: F401
+    baseline = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as workdir:
+        MODES[mode](workdir)
+    print(f"{mode:<9} peak RSS +{peak_rss_mb() - baseline:7.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--archive-mb', type=int, default=200)
+    parser.add_argument('--mode', choices=sorted(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        zipball = os.path.join(workdir, 'zipball.zip')
+        build_zipball(zipball, args.archive_mb)
+        server = serve_file(zipball)
+        env = dict(os.environ, GITHUB_API_URL=f"http://127.0.0.1:{server.server_address[1]}")
+        print(f"{args.archive_mb} MB zipball")
+        try:
+            for mode in ('buffered', 'streamed'):
+                subprocess.run([sys.executable, __file__, '--mode', mode], env=env, check=True)
+        finally:
+            server.shutdown()
+
+if __name__ == '__main__':
+    main()
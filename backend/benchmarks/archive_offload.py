@@ -0,0 +1,81 @@
+"""Event-loop lag while deploy archive work runs on a thread versus the executor's process pool.
+
+Repacks a Lambda package and compresses a static site's assets from a generated archive, the
+work a deploy does between download and upload, while a probe coroutine measures how late the
+loop wakes it. Every API request waits on the same loop, so probe lag is added to their latency.
+
+Run from backend/:  python benchmarks/archive_offload.py [--files 2000] [--file-bytes 16384]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.executor import executor
+from app.services.archive_tasks import list_site_files, prepare_assets, repack_archive
+
+PROBE_INTERVAL = 0.005
+
+def build_archive(path: str, files: int, file_bytes: int):
+    rnd = random.Random(files)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for i in range(files):
+            text = ''.join(rnd.choices(string.ascii_letters + ' \n', k=file_bytes))
+            archive.writestr(f'owner-repo-abc123/src/{i // 500}/module{i}.js', text)
+
+def archive_work(archive_path: str, package_path: str):
+    """One deploy's CPU work: repack into a package, then compress every asset in batches"""
+    repack_archive(archive_path, package_path)
+    members = [(name, key, 'gzip') for name, key, _ in list_site_files(archive_path)]
+    for i in range(0, len(members), 128):
+        prepare_assets(archive_path, members[i:i + 128], 9)
+
+async def probe(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - started - PROBE_INTERVAL) * 1000)
+
+async def measure(offload, archive_path: str, package_path: str):
+    stop = asyncio.Event()
+    lags = []
+    probing = asyncio.create_task(probe(stop, lags))
+    started = time.perf_counter()
+    await offload(archive_work, archive_path, package_path)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probing
+    return elapsed, sorted(lags)
+
+def report(label: str, elapsed: float, lags: list):
+    p99 = lags[max(int(len(lags) * 0.99) - 1, 0)]
+    print(f"{label:<14} work {elapsed:6.2f}s   loop lag p50 {statistics.median(lags):7.2f} ms   "
+          f"p99 {p99:7.2f} ms   max {lags[-1]:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--file-bytes', type=int, default=16384)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        archive_path = os.path.join(workdir, 'repo.zip')
+        package_path = os.path.join(workdir, 'package.zip')
+        build_archive(archive_path, args.files, args.file_bytes)
+
+        # Start the worker processes up front so spawn time isn't counted
+        asyncio.run(executor.run_cpu(list_site_files, archive_path))
+        report("thread", *asyncio.run(measure(asyncio.to_thread, archive_path, package_path)))
+        report("process pool", *asyncio.run(measure(executor.run_cpu, archive_path, package_path)))
+        executor.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Per-call latency of a pooled AWSClient client versus a new boto3 client per call, under moto.
+
+Run from backend/:  python benchmarks/aws_client_pool.py [--calls 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import boto3
+from moto import mock_aws
+from app.aws_client import aws_client
+
+def measure(call, calls: int) -> list:
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def report(label: str, timings: list):
+    timings = sorted(timings)
+    print(f"{label:<22} median {statistics.median(timings):7.2f} ms   p99 {timings[int(len(timings) * 0.99) - 1]:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+
+    with mock_aws():
+        region = aws_client.default_region
+        boto3.client('ec2', region_name=region).run_instances(ImageId='ami-12345678', MinCount=5, MaxCount=5)
+
+        def new_client_per_call():
+            boto3.client('ec2', region_name=region).describe_instances()
+
+        def pooled_client():
+            aws_client.get_client('ec2', region).describe_instances()
+
+        # Warm both paths once so imports and model loading aren't counted
+        new_client_per_call()
+        pooled_client()
+
+        report("new client per call", measure(new_client_per_call, args.calls))
+        report("pooled client", measure(pooled_client, args.calls))
+
+if __name__ == '__main__':
+    main()
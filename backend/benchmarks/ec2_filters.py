@@ -0,0 +1,75 @@
+"""Payload size and latency of GET /api/ec2/instances with and without server-side filters,
+over a seeded fleet on a moto server.
+
+Without filters the frontend has to download the whole fleet and filter it client-side;
+with them describe_instances drops non-matching instances before they reach the API.
+
+Run from backend/:  python benchmarks/ec2_filters.py [--instances 420] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _moto import moto_server
+
+REGION = 'us-east-1'
+INSTANCE_TYPES = ['t3.micro', 't3.small', 'm5.large']
+ENVIRONMENTS = ['prod', 'staging', 'dev', 'test', 'qa', 'perf', 'demo', 'sandbox', 'ci', 'load']
+
+QUERIES = [
+    ("unfiltered", {}),
+    ("state=running", {'state': 'running'}),
+    ("instance_type=m5.large", {'instance_type': 'm5.large'}),
+    ("tag=env=prod", {'tag': 'env=prod'}),
+    ("state + type + tag", {'state': 'running', 'instance_type': 't3.micro', 'tag': 'env=prod'}),
+]
+
+def seed_fleet(ec2_client, instances: int):
+    """Launch instances spread over types and env tags, and stop roughly two thirds of them"""
+    launched = []
+    batch = 20
+    for i in range(0, instances, batch):
+        count = min(batch, instances - i)
+        environment = ENVIRONMENTS[(i // batch) % len(ENVIRONMENTS)]
+        response = ec2_client.run_instances(
+            ImageId='ami-12345678', MinCount=count, MaxCount=count,
+            InstanceType=INSTANCE_TYPES[(i // batch) % len(INSTANCE_TYPES)],
+            TagSpecifications=[{
+                'ResourceType': 'instance',
+                'Tags': [{'Key': 'env', 'Value': environment}, {'Key': 'Name', 'Value': f'bench-{i}'}]
+            }]
+        )
+        launched.extend(instance['InstanceId'] for instance in response['Instances'])
+    stopped = [instance_id for index, instance_id in enumerate(launched) if index % 3]
+    for i in range(0, len(stopped), 1000):
+        ec2_client.stop_instances(InstanceIds=stopped[i:i + 1000])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--instances', type=int, default=420)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with moto_server():
+        from fastapi.testclient import TestClient
+        from app.aws_client import aws_client
+        from main import app
+
+        seed_fleet(aws_client.get_client('ec2', REGION), args.instances)
+        client = TestClient(app)
+        print(f"{'query':<24} {'instances':>9} {'payload':>10} {'median':>9}")
+        for label, params in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.get('/api/ec2/instances', params={'region': REGION, **params})
+                timings.append(time.perf_counter() - started)
+                response.raise_for_status()
+            print(f"{label:<24} {len(response.json()):>9} {len(response.content) / 1024:>8.1f}KB "
+                  f"{statistics.median(timings) * 1000:>7.0f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Load test: /health latency while EC2 inventory requests are in flight, against a moto server.
+
+Starts the API with uvicorn in-process, measures /health alone, then again while
+--inventory-clients clients keep calling GET /api/ec2/instances (21 regions each).
+--aws-delay adds a sleep to every AWS call to stand in for real network latency.
+
+Run from backend/:  python benchmarks/health_under_load.py [--requests 500] [--aws-delay 0.05]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _moto import moto_server
+
+import httpx
+import uvicorn
+from app.aws_client import aws_client
+from main import app
+
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+def start_server() -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=PORT, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+async def health_latencies(client: httpx.AsyncClient, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get('/health')
+        response.raise_for_status()
+        timings.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return timings
+
+async def inventory_load(client: httpx.AsyncClient, stop: asyncio.Event, completed: list):
+    while not stop.is_set():
+        response = await client.get('/api/ec2/instances')
+        response.raise_for_status()
+        completed.append(1)
+
+def report(label: str, timings: list):
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{label:<34} p50 {statistics.median(timings):7.2f} ms   p99 {p99:7.2f} ms   max {timings[-1]:7.2f} ms")
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=120) as client:
+        report("/health idle", await health_latencies(client, args.requests))
+
+        stop = asyncio.Event()
+        completed = []
+        load = [asyncio.create_task(inventory_load(client, stop, completed)) for _ in range(args.inventory_clients)]
+        await asyncio.sleep(0.5)
+        timings = await health_latencies(client, args.requests)
+        stop.set()
+        await asyncio.gather(*load)
+        report(f"/health with {args.inventory_clients} inventory clients", timings)
+        print(f"inventory requests completed during the run: {len(completed)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--inventory-clients', type=int, default=8)
+    parser.add_argument('--aws-delay', type=float, default=0.05, help="seconds added to every AWS call")
+    args = parser.parse_args()
+
+    with moto_server():
+        if args.aws_delay:
+            def delay(**kwargs):
+                time.sleep(args.aws_delay)
+            # Registered first so the sleep happens before moto answers the request
+            aws_client._session.events.register_first('before-send', delay)
+        server = start_server()
+        try:
+            asyncio.run(run(args))
+        finally:
+            server.should_exit = True
+
+if __name__ == '__main__':
+    main()
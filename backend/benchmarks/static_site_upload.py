@@ -0,0 +1,78 @@
+"""Static-site upload time for 10 / 1k / 10k-file sites against a moto server: the original
+sequential put_object loop versus StaticSiteUploader.
+
+--aws-delay adds a sleep to every S3 call to stand in for the network round trip to real S3;
+moto itself answers in well under a millisecond of network time.
+
+Run from backend/:  python benchmarks/static_site_upload.py [--sizes 10 1000 10000] [--aws-delay 0.02]
+"""
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _moto import moto_server
+
+def build_site(path: str, files: int, file_bytes: int):
+    rnd = random.Random(files)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('owner-repo-abc123/index.html', '<html><body>bench</body></html>')
+        for i in range(files - 1):
+            text = ''.join(rnd.choices(string.ascii_letters + ' \n', k=file_bytes))
+            archive.writestr(f'owner-repo-abc123/assets/{i // 500}/file{i}.js', text)
+
+def sequential_upload(s3_client, archive_path: str, bucket: str) -> int:
+    """The pre-change upload loop: one put_object per file, in order"""
+    uploaded = 0
+    with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+        for file_info in zip_ref.filelist:
+            if not file_info.is_dir() and not file_info.filename.startswith('.'):
+                clean_name = '/'.join(file_info.filename.split('/')[1:])
+                if clean_name:
+                    s3_client.put_object(Bucket=bucket, Key=clean_name, Body=zip_ref.read(file_info.filename))
+                    uploaded += 1
+    return uploaded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--file-bytes', type=int, default=4096)
+    parser.add_argument('--aws-delay', type=float, default=0.02, help="seconds added to every S3 call")
+    args = parser.parse_args()
+
+    with moto_server(), tempfile.TemporaryDirectory() as workdir:
+        from app.aws_client import aws_client
+        from app.executor import executor
+        from app.services.static_site import static_site_uploader
+
+        if args.aws_delay:
+            # Registered before any client exists, since clients copy the session's handlers when created
+            aws_client._session.events.register_first('before-send', lambda **kwargs: time.sleep(args.aws_delay))
+        s3_client = aws_client.get_client('s3')
+        print(f"{'files':>6}  {'sequential':>11}  {'parallel':>9}  {'speedup':>7}  parallel throughput")
+        for files in args.sizes:
+            archive_path = os.path.join(workdir, f'site-{files}.zip')
+            build_site(archive_path, files, args.file_bytes)
+
+            s3_client.create_bucket(Bucket=f'bench-sequential-{files}')
+            started = time.perf_counter()
+            sequential_upload(s3_client, archive_path, f'bench-sequential-{files}')
+            sequential = time.perf_counter() - started
+
+            s3_client.create_bucket(Bucket=f'bench-parallel-{files}')
+            started = time.perf_counter()
+            report = asyncio.run(static_site_uploader.upload_archive(archive_path, f'bench-parallel-{files}'))
+            parallel = time.perf_counter() - started
+
+            print(f"{files:>6}  {sequential:>10.2f}s  {parallel:>8.2f}s  {sequential / parallel:>6.1f}x  "
+                  f"{report['files_per_second']} files/s, {report['mb_per_second']} MB/s")
+        executor.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import ec2, s3, rds, lambda_functions, github, webhooks
+from app.routers import ec2, s3, rds, lambda_functions, github, webhooks, jobs
+from app.aws_client import aws_client
+from app.executor import executor
+from app.github_client import github_client
 import uvicorn
 
-app = FastAPI(title="AWS Resource Monitor", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled connections and worker threads on shutdown
+    executor.shutdown()
+    aws_client.close()
+    github_client.close()
+
+app = FastAPI(title="AWS Resource Monitor", version="1.0.0", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -19,6 +31,7 @@ app.include_router(ec2.router, prefix="/api/ec2", tags=["EC2"])
 app.include_router(s3.router, prefix="/api/s3", tags=["S3"])
 app.include_router(rds.router, prefix="/api/rds", tags=["RDS"])
 app.include_router(lambda_functions.router, prefix="/api/lambda", tags=["Lambda"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 app.include_router(github.router, prefix="/api")
 app.include_router(webhooks.router, prefix="/api")
 @app.get("/")
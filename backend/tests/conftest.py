@@ -0,0 +1,56 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+class FakeGitHub:
+    """A local stand-in for the GitHub API: serves JSON resources with ETags and honours If-None-Match"""
+
+    def __init__(self):
+        self.resources = {}
+        self.requests = []
+        # Seconds to stall before answering, to simulate a hung connection
+        self.delay = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests.append({'path': self.path, 'headers': dict(self.headers)})
+                time.sleep(fake.delay)
+                path = self.path.split('?')[0]
+                if path not in fake.resources:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body, etag = fake.resources[path]
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def serve(self, path: str, body, etag: str = None):
+        self.resources[path] = (body, etag)
+
+@pytest.fixture
+def fake_github():
+    fake = FakeGitHub()
+    thread = threading.Thread(target=fake.server.serve_forever, daemon=True)
+    thread.start()
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
@@ -0,0 +1,15 @@
+import io
+from app.cache import ArtifactCache
+
+def test_eviction_skips_artifacts_still_open(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=1500)
+    in_use = cache.store(io.BytesIO(b'a' * 1000), 'repo', 'a', 'archive')
+
+    # Over budget, but the only other artifact is still open, so both stay
+    cache.store(io.BytesIO(b'b' * 1000), 'repo', 'b', 'archive').close()
+    assert cache.stats()['entries'] == 2
+    assert in_use.read() == b'a' * 1000
+
+    in_use.close()
+    cache.store(io.BytesIO(b'c' * 1000), 'repo', 'c', 'archive').close()
+    assert cache.open('repo', 'a', 'archive') is None
@@ -0,0 +1,75 @@
+import pytest
+import requests
+from app.github_client import GitHubClient
+
+@pytest.fixture
+def client(fake_github, tmp_path, monkeypatch):
+    monkeypatch.setenv('GITHUB_API_URL', fake_github.url)
+    monkeypatch.setenv('GITHUB_CACHE_DIR', str(tmp_path / 'github'))
+    client = GitHubClient()
+    yield client
+    client.close()
+
+def test_revalidates_with_etag_and_serves_304_from_cache(client, fake_github):
+    fake_github.serve('/user/repos', [{'id': 1}], etag='"v1"')
+
+    first, _ = client.get_json('token', '/user/repos')
+    second, _ = client.get_json('token', '/user/repos')
+
+    assert first == second == [{'id': 1}]
+    assert 'If-None-Match' not in fake_github.requests[0]['headers']
+    assert fake_github.requests[1]['headers']['If-None-Match'] == '"v1"'
+    stats = client.cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+def test_changed_resource_is_refetched(client, fake_github):
+    fake_github.serve('/user/repos', [{'id': 1}], etag='"v1"')
+    client.get_json('token', '/user/repos')
+    fake_github.serve('/user/repos', [{'id': 2}], etag='"v2"')
+
+    body, headers = client.get_json('token', '/user/repos')
+
+    assert body == [{'id': 2}]
+    assert headers['ETag'] == '"v2"'
+    assert client.cache_stats()['misses'] == 2
+
+def test_cache_is_keyed_per_token(client, fake_github):
+    fake_github.serve('/user/repos', [{'id': 1}], etag='"v1"')
+    client.get_json('token-a', '/user/repos')
+    client.get_json('token-b', '/user/repos')
+
+    assert 'If-None-Match' not in fake_github.requests[1]['headers']
+
+def test_responses_without_validators_are_not_cached(client, fake_github):
+    fake_github.serve('/rate_limit', {'remaining': 10})
+    client.get_json('token', '/rate_limit')
+    client.get_json('token', '/rate_limit')
+
+    assert client.cache_stats()['entries'] == 0
+    assert 'If-None-Match' not in fake_github.requests[1]['headers']
+
+def test_cache_evicts_least_recently_used_entries(fake_github, tmp_path, monkeypatch):
+    monkeypatch.setenv('GITHUB_API_URL', fake_github.url)
+    monkeypatch.setenv('GITHUB_CACHE_DIR', str(tmp_path / 'github'))
+    monkeypatch.setenv('GITHUB_CACHE_MAX_BYTES', '2500')
+    client = GitHubClient()
+    for name in ('a', 'b', 'c'):
+        fake_github.serve(f'/repos/{name}', {'blob': name * 1000}, etag=f'"{name}"')
+        client.get_json('token', f'/repos/{name}')
+
+    stats = client.cache_stats()
+    assert stats['entries'] == 2
+    assert stats['bytes'] <= 2500
+
+    # The oldest entry went first, so it is fetched in full again
+    client.get_json('token', '/repos/a')
+    assert 'If-None-Match' not in fake_github.requests[-1]['headers']
+    client.close()
+
+def test_stalled_response_times_out(client, fake_github):
+    fake_github.serve('/user/repos', [{'id': 1}])
+    fake_github.delay = 1
+    client.timeout = (1, 0.2)
+
+    with pytest.raises(requests.Timeout):
+        client.get_json('token', '/user/repos')
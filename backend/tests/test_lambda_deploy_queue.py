@@ -0,0 +1,46 @@
+import asyncio
+from app.services.lambda_deploy import LambdaDeployQueue
+
+def deploy(result, started=None, release=None):
+    async def work():
+        if started:
+            started.set()
+        if release:
+            await release.wait()
+        return result
+    return work
+
+def test_cancelled_deploy_is_not_run_for_the_deploys_it_replaced():
+    async def scenario():
+        queue = LambdaDeployQueue()
+        started, release = asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(queue.submit('r', 'fn', deploy(1, started, release)))
+        await started.wait()
+        second = asyncio.create_task(queue.submit('r', 'fn', deploy(2)))
+        third = asyncio.create_task(queue.submit('r', 'fn', deploy(3)))
+        await asyncio.sleep(0)
+        third.cancel()
+        release.set()
+        return await first, await second, await asyncio.gather(third, return_exceptions=True)
+
+    first, second, (third,) = asyncio.run(scenario())
+    assert first == (1, False)
+    assert second == (2, False)
+    assert isinstance(third, asyncio.CancelledError)
+
+def test_cancelling_running_deploy_falls_back_to_the_one_it_replaced():
+    async def scenario():
+        queue = LambdaDeployQueue()
+        blocker_started, blocker_release = asyncio.Event(), asyncio.Event()
+        blocker = asyncio.create_task(queue.submit('r', 'fn', deploy(0, blocker_started, blocker_release)))
+        await blocker_started.wait()
+        older = asyncio.create_task(queue.submit('r', 'fn', deploy(1)))
+        newer_started = asyncio.Event()
+        newer = asyncio.create_task(queue.submit('r', 'fn', deploy(2, newer_started, asyncio.Event())))
+        await asyncio.sleep(0)
+        blocker_release.set()
+        await newer_started.wait()
+        newer.cancel()
+        return await blocker, await older
+
+    assert asyncio.run(scenario()) == ((0, False), (1, False))
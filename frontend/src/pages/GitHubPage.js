@@ -25,6 +25,14 @@ const GitHubPage = () => {
     fetchDeployments();
   }, []);
 
+  // Deployments run in the background; poll while any of them is still active
+  const hasActiveDeployments = deployments.some(d => ['pending', 'building', 'deploying'].includes(d.status));
+  useEffect(() => {
+    if (!hasActiveDeployments) return undefined;
+    const timer = setInterval(fetchDeployments, 3000);
+    return () => clearInterval(timer);
+  }, [hasActiveDeployments]);
+
   const fetchDeploymentTemplates = async () => {
     try {
       const response = await fetch('/api/github/deployment-templates');
@@ -109,7 +117,7 @@ const GitHubPage = () => {
       const deployment = await response.json();
       setDeployments(prev => [deployment, ...prev]);
       setShowDeploymentForm(false);
-      toast.success('Deployment started successfully!');
+      toast.success('Deployment queued successfully!');
     } catch (error) {
       toast.error(`Deployment failed: ${error.message}`);
     } finally {
@@ -126,8 +134,10 @@ const GitHubPage = () => {
     const statusVariants = {
       pending: 'warning',
       building: 'info',
+      deploying: 'info',
       success: 'success',
-      failed: 'error'
+      failed: 'error',
+      cancelled: 'default'
     };
 
     return (
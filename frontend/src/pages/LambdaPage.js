@@ -119,18 +119,18 @@ const LambdaPage = () => {
     }
   };
 
-  const handleFunctionAction = async (functionName, action) => {
+  const handleFunctionAction = async (functionName, action, region = null) => {
     try {
       setActionLoading(prev => ({ ...prev, [functionName]: true }));
       setError(null);
       
       if (action === 'invoke') {
-        const response = await lambdaService.invokeFunction(functionName, {});
+        const response = await lambdaService.invokeFunction(functionName, {}, region);
         setSuccess(`Function ${functionName} invoked successfully`);
         console.log('Invocation result:', response.data);
       } else if (action === 'delete') {
         if (window.confirm(`Are you sure you want to delete function "${functionName}"? This action cannot be undone.`)) {
-          await lambdaService.deleteFunction(functionName);
+          await lambdaService.deleteFunction(functionName, region);
           setSuccess(`Function ${functionName} deleted successfully`);
           // Refresh functions list
           setTimeout(() => fetchFunctions(), 1000);
@@ -302,7 +302,7 @@ const LambdaPage = () => {
 
               <div className="flex gap-2">
                 <button
-                  onClick={() => handleFunctionAction(func.function_name, 'invoke')}
+                  onClick={() => handleFunctionAction(func.function_name, 'invoke', func.region)}
                   disabled={actionLoading[func.function_name]}
                   className="btn btn-success flex-1 text-sm"
                 >
@@ -315,7 +315,7 @@ const LambdaPage = () => {
                   🔗
                 </button>
                 <button
-                  onClick={() => handleFunctionAction(func.function_name, 'delete')}
+                  onClick={() => handleFunctionAction(func.function_name, 'delete', func.region)}
                   disabled={actionLoading[func.function_name]}
                   className="btn btn-danger text-sm"
                 >
@@ -116,20 +116,20 @@ const RDSPage = () => {
     }
   };
 
-  const handleInstanceAction = async (instanceId, action) => {
+  const handleInstanceAction = async (instanceId, action, region = null) => {
     try {
       setActionLoading(prev => ({ ...prev, [instanceId]: true }));
       setError(null);
       
       if (action === 'start') {
-        await rdsService.startInstance(instanceId);
+        await rdsService.startInstance(instanceId, region);
         setSuccess(`RDS instance ${instanceId} start initiated`);
       } else if (action === 'stop') {
-        await rdsService.stopInstance(instanceId);
+        await rdsService.stopInstance(instanceId, region);
         setSuccess(`RDS instance ${instanceId} stop initiated`);
       } else if (action === 'delete') {
         if (window.confirm('Are you sure you want to delete this database instance? This action cannot be undone.')) {
-          await rdsService.deleteInstance(instanceId);
+          await rdsService.deleteInstance(instanceId, region);
           setSuccess(`RDS instance ${instanceId} deletion initiated`);
         } else {
           return;
@@ -299,7 +299,7 @@ const RDSPage = () => {
               <div className="flex gap-2">
                 {instance.db_instance_status === 'stopped' && (
                   <button
-                    onClick={() => handleInstanceAction(instance.db_instance_identifier, 'start')}
+                    onClick={() => handleInstanceAction(instance.db_instance_identifier, 'start', instance.region)}
                     disabled={actionLoading[instance.db_instance_identifier]}
                     className="btn btn-success flex-1 text-sm"
                   >
@@ -308,7 +308,7 @@ const RDSPage = () => {
                 )}
                 {instance.db_instance_status === 'available' && (
                   <button
-                    onClick={() => handleInstanceAction(instance.db_instance_identifier, 'stop')}
+                    onClick={() => handleInstanceAction(instance.db_instance_identifier, 'stop', instance.region)}
                     disabled={actionLoading[instance.db_instance_identifier]}
                     className="btn btn-secondary flex-1 text-sm"
                   >
@@ -316,7 +316,7 @@ const RDSPage = () => {
                   </button>
                 )}
                 <button
-                  onClick={() => handleInstanceAction(instance.db_instance_identifier, 'delete')}
+                  onClick={() => handleInstanceAction(instance.db_instance_identifier, 'delete', instance.region)}
                   disabled={actionLoading[instance.db_instance_identifier]}
                   className="btn btn-danger text-sm"
                 >
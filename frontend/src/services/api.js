@@ -13,6 +13,8 @@ const api = axios.create({
 export const ec2Service = {
   getRegions: () => api.get('/ec2/regions'),
   listInstances: (region = null) => api.get('/ec2/instances', { params: region ? { region } : {} }),
+  listInstancesPage: (region = null, cursor = null, pageSize = 100) =>
+    api.get('/ec2/instances/page', { params: { ...(region ? { region } : {}), ...(cursor ? { cursor } : {}), page_size: pageSize } }),
   createInstance: (data) => api.post('/ec2/instances', data),
   terminateInstance: (instanceId, region = null) => 
     api.delete(`/ec2/instances/${instanceId}`, { params: region ? { region } : {} }),
@@ -20,6 +22,7 @@ export const ec2Service = {
     api.post(`/ec2/instances/${instanceId}/start`, {}, { params: region ? { region } : {} }),
   stopInstance: (instanceId, region = null) => 
     api.post(`/ec2/instances/${instanceId}/stop`, {}, { params: region ? { region } : {} }),
+  batchAction: (action, instances) => api.post(`/ec2/instances:batch/${action}`, { instances }),
 };
 
 // S3 Services
@@ -27,25 +30,37 @@ export const s3Service = {
   listBuckets: () => api.get('/s3/buckets'),
   createBucket: (data) => api.post('/s3/buckets', data),
   deleteBucket: (bucketName) => api.delete(`/s3/buckets/${bucketName}`),
-  listObjects: (bucketName) => api.get(`/s3/buckets/${bucketName}/objects`),
+  listObjects: (bucketName, params = {}) => api.get(`/s3/buckets/${bucketName}/objects`, { params }),
 };
 
 // RDS Services
 export const rdsService = {
-  listInstances: () => api.get('/rds/instances'),
+  listInstances: (region = null) => api.get('/rds/instances', { params: region ? { region } : {} }),
+  listClusters: (region = null) => api.get('/rds/clusters', { params: region ? { region } : {} }),
   createInstance: (data) => api.post('/rds/instances', data),
-  deleteInstance: (dbInstanceId) => api.delete(`/rds/instances/${dbInstanceId}`),
-  startInstance: (dbInstanceId) => api.post(`/rds/instances/${dbInstanceId}/start`),
-  stopInstance: (dbInstanceId) => api.post(`/rds/instances/${dbInstanceId}/stop`),
+  deleteInstance: (dbInstanceId, region = null) =>
+    api.delete(`/rds/instances/${dbInstanceId}`, { params: region ? { region } : {} }),
+  startInstance: (dbInstanceId, region = null) =>
+    api.post(`/rds/instances/${dbInstanceId}/start`, {}, { params: region ? { region } : {} }),
+  stopInstance: (dbInstanceId, region = null) =>
+    api.post(`/rds/instances/${dbInstanceId}/stop`, {}, { params: region ? { region } : {} }),
+  batchAction: (action, instances) => api.post(`/rds/instances:batch/${action}`, { instances }),
 };
 
 // Lambda Services
 export const lambdaService = {
-  listFunctions: () => api.get('/lambda/functions'),
+  listFunctions: (region = null, fields = null) =>
+    api.get('/lambda/functions', { params: { ...(region ? { region } : {}), ...(fields ? { fields } : {}) } }),
   createFunction: (data) => api.post('/lambda/functions', data),
-  deleteFunction: (functionName) => api.delete(`/lambda/functions/${functionName}`),
-  invokeFunction: (functionName, payload) => api.post(`/lambda/functions/${functionName}/invoke`, payload),
-  getFunction: (functionName) => api.get(`/lambda/functions/${functionName}`),
+  deleteFunction: (functionName, region = null) =>
+    api.delete(`/lambda/functions/${functionName}`, { params: region ? { region } : {} }),
+  invokeFunction: (functionName, payload, region = null) =>
+    api.post(`/lambda/functions/${functionName}/invoke`, payload, { params: region ? { region } : {} }),
+  batchInvokeFunction: (functionName, payloads, invocationType = 'RequestResponse', region = null) =>
+    api.post(`/lambda/functions/${functionName}/invoke:batch`, { payloads, invocation_type: invocationType },
+      { params: region ? { region } : {} }),
+  getFunction: (functionName, region = null) =>
+    api.get(`/lambda/functions/${functionName}`, { params: region ? { region } : {} }),
 };
 
 export default api;